@@ -0,0 +1,93 @@
+# Generador de corpus sintéticos a partir de la gramática del README:
+#
+#   oracion_svo -> sujetos verbo complemento? .
+#   sujetos     -> sujeto ("y" sujeto)*
+#   verbo       -> "no"? "verbo" objeto? "adverbio"?
+#   complemento -> "preposicion" sujeto
+#
+# Las palabras salen de las listas del tokenizer para que se clasifiquen igual
+# que un texto real; los adjetivos no se pueden deducir del texto, así que se
+# generan ya anotados ("adj:rojo").
+import random
+
+from modules import tokenizer
+
+_DETS = sorted(tokenizer._GENERIC_DETS)
+_SUSTANTIVOS = sorted(w for w, p in tokenizer._BASE_LEXICON.items() if p == "sus") + [
+    "perro", "gato", "casa", "mesa", "parque", "escuela", "pan", "agua"]
+_NOMBRES = ["Ana", "Carlos", "Lucía", "Pedro", "María", "Juan"]
+_ADJETIVOS = ["adj:rojo", "adj:grande", "adj:pequeño", "adj:feliz"]
+_VERBOS = sorted(tokenizer._V_COMMON)
+_ADVERBIOS = sorted(tokenizer._ADV_COMMON)
+_PREPOSICIONES = ["en", "con", "sin", "para", "desde", "hacia"]
+
+
+class CorpusParams:
+    """Parámetros de un corpus sintético.
+
+    - sentences: número de oraciones.
+    - depth: sujetos coordinados con "y" en cada sujeto/objeto (1 = sin coordinación).
+    - lineLength: palabras por línea antes de partir (0 = todo en una línea).
+    - errorRate: fracción de oraciones a las que se les quita el verbo.
+    - seed: semilla, para que el corpus sea reproducible.
+    """
+    def __init__(self, sentences=10_000, depth=1, lineLength=20, errorRate=0.0, seed=0):
+        self.sentences = sentences
+        self.depth = depth
+        self.lineLength = lineLength
+        self.errorRate = errorRate
+        self.seed = seed
+
+    def asdict(self) -> dict:
+        return dict(vars(self))
+
+
+def _sujeto(rng: random.Random) -> list[str]:
+    if (rng.random() < 0.3):
+        words = [rng.choice(_NOMBRES)]
+    else:
+        words = [rng.choice(_SUSTANTIVOS)]
+        if (rng.random() < 0.8): words.insert(0, rng.choice(_DETS))
+
+    if (rng.random() < 0.2): words.append(rng.choice(_ADJETIVOS))
+    return words
+
+
+def _sujetos(rng: random.Random, depth: int) -> list[str]:
+    words = _sujeto(rng)
+    for _ in range(depth - 1):
+        words.append("y")
+        words.extend(_sujeto(rng))
+    return words
+
+
+def sentence(rng: random.Random, params: CorpusParams) -> list[str]:
+    words = _sujetos(rng, params.depth)
+
+    if (rng.random() < 0.2): words.append("no")
+    if (rng.random() >= params.errorRate): words.append(rng.choice(_VERBOS))
+    if (rng.random() < 0.6): words.extend(_sujetos(rng, params.depth))
+    if (rng.random() < 0.2): words.append(rng.choice(_ADVERBIOS))
+
+    if (rng.random() < 0.4):
+        words.append(rng.choice(_PREPOSICIONES))
+        words.extend(_sujeto(rng))
+
+    words[-1] += "."
+    return words
+
+
+def generate(params: CorpusParams) -> str:
+    """Devuelve el texto del corpus descrito por `params`."""
+    rng = random.Random(params.seed)
+
+    lines: list[str] = []
+    line: list[str] = []
+    for _ in range(params.sentences):
+        line.extend(sentence(rng, params))
+        if (params.lineLength and len(line) >= params.lineLength):
+            lines.append(" ".join(line))
+            line = []
+
+    if (line): lines.append(" ".join(line))
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+# Equivalencia de los caminos alternativos del pipeline con el de referencia
+# (`scanner.direct_tokens` + `RDParser`) sobre corpus generados:
+#
+# - LLParser: mismo AST, mismos errores (línea, columna y mensaje) y mismos
+#   tokens saltados al recuperarse que RDParser, con la misma lista de tokens.
+# - validate.validate: mismo veredicto y mismos errores que el análisis completo.
+# - incremental.Document.edit: tras cada edición, el mismo párrafo, errores y
+#   tokens que `stream.parse_stream` sobre el texto editado.
+#
+#   python -m benchmarks.equivalence --cases 2000
+#
+# Los textos salen de `corpus.generate` (con oraciones sin verbo) y se les
+# insertan palabras sueltas, anotadas o con caracteres no permitidos, para
+# pasar también por la recuperación de errores y el camino de PLY.
+import argparse
+import io
+import random
+import sys
+
+from modules import scanner, state, stream, validate
+from modules.incremental import Document
+from modules.ply_lex import LexToken
+from modules.rd_parcer.parser import RDParser
+from modules.rd_parcer.ll_parser import LLParser
+from benchmarks.corpus import CorpusParams, generate
+
+_NOISE = ["El", "perro", "come", "pan", ".", "y", "no", "Ana", "casa", "en", "la", "x",
+          "adj:rojo", "det:el", "ver:come.", "det:a.b", "y.", "no.", "a.b", "perro,", "@", "det:",
+          "\n", "\n\n", " . "]
+
+EDITS = 8
+
+
+def _dump(astNode):
+    """AST (o token, lista o None) como tuplas comparables."""
+    match astNode:
+        case None: return None
+        case LexToken():
+            return (astNode.type, astNode.value, astNode.lineno, astNode.lexpos)
+        case list():
+            return [_dump(el) for el in astNode]
+
+    return (type(astNode).__name__,) + tuple(_dump(getattr(astNode, name)) for name in type(astNode).__slots__)
+
+
+def _errors(errors: list[state.Diagnostic]) -> list[tuple]:
+    return [(e.line, e.column, str(e)) for e in errors]
+
+
+def _noise(rng: random.Random) -> str:
+    return rng.choice(_NOISE) + rng.choice(["", " "])
+
+
+def text(rng: random.Random, case: int) -> str:
+    params = CorpusParams(rng.randint(1, 8), rng.randint(1, 3), rng.choice([0, 3, 10]), rng.random() * 0.4, case)
+    source = generate(params)
+    for _ in range(rng.randint(0, 3)):
+        pos = rng.randint(0, len(source))
+        source = source[:pos] + _noise(rng) + source[pos:]
+    return source
+
+
+def check_ll(source: str) -> str:
+    tokens = list(scanner.direct_tokens(source, state.Diagnostics()))
+    rd, ll = RDParser(tokens, state.Diagnostics()), LLParser(tokens, state.Diagnostics())
+    expected, result = rd.parse(), ll.parse()
+
+    if (_dump(result) != _dump(expected)): return "LLParser: AST distinto"
+    if (_errors(ll.diagnostics.errors) != _errors(rd.diagnostics.errors)): return "LLParser: errores distintos"
+    if (ll.recoverySkips != rd.recoverySkips): return "LLParser: recuperación distinta"
+    return None
+
+
+def check_validate(source: str) -> str:
+    full = state.Diagnostics()
+    RDParser(scanner.direct_tokens(source, full), full).parse()
+
+    diagnostics = state.Diagnostics()
+    if (validate.validate(source, diagnostics) != (not full.hadError)): return "validate: veredicto distinto"
+    if (_errors(diagnostics.errors) != _errors(full.errors)): return "validate: errores distintos"
+    return None
+
+
+def check_incremental(source: str, rng: random.Random) -> str:
+    document = Document(source)
+    for _ in range(EDITS):
+        offset = rng.randint(0, len(document.text))
+        removed = rng.randint(0, min(6, len(document.text) - offset))
+        document.edit(offset, removed, "".join(_noise(rng) for _ in range(rng.randint(0, 3))))
+
+        diagnostics = state.Diagnostics()
+        expected = list(stream.parse_stream(io.StringIO(document.text), diagnostics))
+        if (_dump(document.parrafo) != _dump(expected)):
+            return f"Document.edit: párrafo distinto tras editar a {document.text!r}"
+        if (_errors(document.errors) != _errors(diagnostics.errors)):
+            return f"Document.edit: errores distintos tras editar a {document.text!r}"
+
+        fresh = Document(document.text)
+        if (_dump([s.tokens for s in document.segments]) != _dump([s.tokens for s in fresh.segments])):
+            return f"Document.edit: tokens distintos tras editar a {document.text!r}"
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Equivalencia de LLParser, validate e incremental con RDParser")
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for case in range(args.cases):
+        source = text(rng, case)
+        failure = check_ll(source) or check_validate(source) or check_incremental(source, rng)
+        if (failure):
+            print(f"caso {case}: {failure}\n{source!r}")
+            return 1
+
+    print(f"{args.cases} casos equivalentes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
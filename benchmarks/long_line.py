@@ -0,0 +1,66 @@
+# Regresión de rendimiento: documentos de una sola línea muy larga.
+#
+# `annotate_source` consumía cada línea con `words.pop(0)` (cuadrático en el
+# número de palabras de la línea). Este benchmark etiqueta líneas de 25k, 50k
+# y 100k palabras y falla si el tiempo por palabra crece con la longitud.
+#
+#   python -m benchmarks.long_line
+import sys
+import time
+
+from modules import scanner, state
+from modules.tokenizer import annotate_source
+
+SIZES = (25_000, 50_000, 100_000)
+
+# Tolerancia frente al ruido: un algoritmo lineal da un cociente ~1,
+# el antiguo pop(0) daba ~4 entre 25k y 100k palabras.
+MAX_SLOWDOWN = 2.0
+
+_SENTENCE = "El niño come manzanas en la ciudad.".split()
+
+
+def long_line(words: int) -> str:
+    return " ".join(_SENTENCE[i % len(_SENTENCE)] for i in range(words))
+
+
+def _best_of(fn, repeat=3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    stages = {
+        "annotate_source": annotate_source,
+        "direct_tokens": lambda line: sum(1 for _ in scanner.direct_tokens(line, state.Diagnostics())),
+    }
+
+    failed = False
+    for name, stage in stages.items():
+        perWord = []
+        for size in SIZES:
+            line = long_line(size)
+            seconds = _best_of(lambda: stage(line))
+            perWord.append(seconds / size)
+            print(f"{name:16} {size:>7} palabras  {seconds*1000:8.1f} ms  {seconds/size*1e6:6.2f} us/palabra")
+
+        slowdown = perWord[-1] / perWord[0]
+        if (slowdown > MAX_SLOWDOWN):
+            print(f"{name}: el coste por palabra crece x{slowdown:.1f} con la longitud de la línea")
+            failed = True
+
+    # Los puntos separados deben quedar en su sitio
+    annotated = annotate_source(long_line(len(_SENTENCE) * 2)).split()
+    if (annotated[len(_SENTENCE)] != "."):
+        print("annotate_source no conserva el orden de las palabras")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# Benchmark por etapas del pipeline: annotate_source, scanner.tokens,
+# scanner.direct_tokens, RDParser.parse, LLParser.parse, print_esp y
+# validate.validate (solo aceptar/rechazar, desde el texto).
+#
+#   python -m benchmarks.run --sentences 20000 --depth 2 --output bench.json
+#   python -m benchmarks.run --compare bench.json
+#
+# Cada etapa se cronometra por separado (mejor de --repeat pasadas) y después
+# se mide su pico de memoria con tracemalloc en una pasada aparte, para que el
+# trazado no afecte a los tiempos.
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from modules import scanner, state, validate
+from modules.rd_parcer.parser import RDParser
+from modules.rd_parcer.ll_parser import LLParser
+from modules.rd_parcer.printer import print_esp
+from modules.tokenizer import annotate_source
+from benchmarks.corpus import CorpusParams, generate
+
+# Un tiempo peor que el de referencia en más de este factor cuenta como regresión
+REGRESSION = 1.25
+
+
+def _stages(text: str):
+    """Devuelve [(nombre, función)] con la entrada de cada etapa ya preparada."""
+    annotated = annotate_source(text)
+    tokens = list(scanner.tokens(annotated, state.Diagnostics()))
+    parrafo = RDParser(tokens, state.Diagnostics()).parse()
+
+    stages = [
+        ("annotate_source", lambda: annotate_source(text)),
+        ("scanner.tokens", lambda: list(scanner.tokens(annotated, state.Diagnostics()))),
+        ("scanner.direct_tokens", lambda: list(scanner.direct_tokens(text, state.Diagnostics()))),
+        ("RDParser.parse", lambda: RDParser(tokens, state.Diagnostics()).parse()),
+        ("LLParser.parse", lambda: LLParser(tokens, state.Diagnostics()).parse()),
+        ("validate.validate", lambda: validate.validate(text, state.Diagnostics())),
+    ]
+
+    stages.append(("print_esp", lambda: print_esp(parrafo, io.StringIO())))
+
+    return stages, len(tokens) - 1
+
+
+def _time(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(params: CorpusParams, repeat: int = 3) -> dict:
+    text = generate(params)
+    stages, tokenCount = _stages(text)
+
+    results = {}
+    for name, fn in stages:
+        seconds = _time(fn, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "tokens_per_s": tokenCount / seconds,
+            "sentences_per_s": params.sentences / seconds,
+            "peak_bytes": _peak_memory(fn),
+        }
+
+    return {
+        "params": params.asdict(),
+        "python": platform.python_version(),
+        "chars": len(text),
+        "tokens": tokenCount,
+        "stages": results,
+    }
+
+
+def report(result: dict, baseline: dict = None, threshold: float = REGRESSION) -> bool:
+    """Imprime los resultados; devuelve False si alguna etapa empeora frente a `baseline`."""
+    ok = True
+    print(f"{result['params']}  {result['tokens']} tokens, {result['chars']} caracteres")
+
+    for name, r in result["stages"].items():
+        line = (f"{name:22} {r['seconds']*1000:9.1f} ms  {r['tokens_per_s']:12,.0f} tokens/s"
+                f"  {r['sentences_per_s']:10,.0f} oraciones/s  pico {r['peak_bytes']/2**20:7.1f} MiB")
+
+        old = (baseline or {}).get("stages", {}).get(name)
+        if (old):
+            ratio = r["seconds"] / old["seconds"]
+            line += f"  x{ratio:.2f}"
+            if (ratio > threshold):
+                line += "  REGRESIÓN"
+                ok = False
+        print(line)
+
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark por etapas del pipeline de esp")
+    parser.add_argument("--sentences", type=int, default=10_000)
+    parser.add_argument("--depth", type=int, default=1, help="sujetos coordinados con 'y'")
+    parser.add_argument("--line-length", type=int, default=20, help="palabras por línea (0 = una sola línea)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="guardar los resultados en este JSON")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--threshold", type=float, default=REGRESSION,
+                        help="factor de tiempo frente a --compare que cuenta como regresión")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if (args.compare):
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    if (baseline and not any(vars(args)[k] != parser.get_default(k)
+                             for k in ("sentences", "depth", "line_length", "error_rate", "seed"))):
+        # sin parámetros explícitos se repite el corpus de la referencia
+        params = CorpusParams(**baseline["params"])
+    else:
+        params = CorpusParams(args.sentences, args.depth, args.line_length, args.error_rate, args.seed)
+
+    result = run(params, args.repeat)
+    ok = report(result, baseline, args.threshold)
+
+    if (args.output):
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
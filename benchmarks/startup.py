@@ -0,0 +1,114 @@
+# Arranque en frío de la CLI: `esp.py` se llama desde scripts miles de veces
+# por lote, así que lo que importa es el tiempo de un proceso nuevo con una
+# oración corta, no el rendimiento por token.
+#
+#   python -m benchmarks.startup
+#
+# Para cada modo se mide la mediana de --runs procesos y se le resta la de un
+# `python -c pass`, de modo que el presupuesto (en ms) no depende de lo que
+# tarde el intérprete en arrancar en cada máquina. Además se comprueba que
+# ningún modo importa módulos que no usa (el servidor, el pool de procesos,
+# la reflexión de PLY...). Falla si algún modo se pasa de presupuesto o
+# importa algo prohibido.
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ESP = os.path.join(ROOT, "esp.py")
+
+_SOURCE = "El perro come manzanas en la ciudad.\n"
+
+# Módulos que solo se usan en otros modos (o al construir el lexer de PLY)
+_NEVER = ("asyncio", "multiprocessing", "concurrent.futures", "inspect",
+          "modules.server", "modules.stats")
+
+# modo: (argumentos de esp.py, presupuesto en ms sobre `python -c pass`, módulos prohibidos)
+MODES = {
+    "check": (["--check"], 40, _NEVER + ("pickle", "tempfile", "modules.cache",
+                                         "modules.output", "modules.rd_parcer.printer")),
+    "tree": ([], 50, _NEVER + ("pickle", "tempfile", "modules.cache", "modules.output")),
+    "jsonl": (["--format", "jsonl"], 60, _NEVER + ("pickle", "tempfile", "modules.cache",
+                                                   "modules.rd_parcer.printer")),
+}
+
+# Ejecuta esp.py como `python esp.py ...` y escribe en stderr los módulos importados
+_LIST_MODULES = """
+import runpy, sys
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+sys.stderr.write("\\n" + " ".join(sorted(sys.modules)))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # sin caché de análisis: se mide el camino completo (y no se importa `cache`)
+    env.pop("ESP_CACHE_DIR", None)
+    return env
+
+
+def _median_ms(argv: list[str], runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, env=_env(), cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def _imported(args: list[str]) -> set[str]:
+    done = subprocess.run([sys.executable, "-c", _LIST_MODULES, ESP, *args], stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, env=_env(), cwd=ROOT, text=True, check=True)
+    return set(done.stderr.rsplit("\n", 1)[-1].split())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Arranque en frío de esp.py por modo")
+    parser.add_argument("--runs", type=int, default=20, help="procesos por modo (se toma la mediana)")
+    args = parser.parse_args(argv)
+
+    # Con PYTHONDONTWRITEBYTECODE cada proceso volvería a compilar todo:
+    # se mide el caso normal, con el bytecode ya en __pycache__
+    compileall.compile_file(ESP, quiet=2)
+    compileall.compile_dir(os.path.join(ROOT, "modules"), quiet=2)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "oracion.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(_SOURCE)
+
+        # primera ejecución aparte: escribe la tabla del lexer si hace falta
+        subprocess.run([sys.executable, ESP, path], stdout=subprocess.DEVNULL, env=_env(), cwd=ROOT)
+
+        interpreter = _median_ms([sys.executable, "-c", "pass"], args.runs)
+        print(f"{'python -c pass':16} {interpreter:8.1f} ms")
+
+        for name, (modeArgs, budget, forbidden) in MODES.items():
+            overhead = _median_ms([sys.executable, ESP, *modeArgs, path], args.runs) - interpreter
+            line = f"{name:16} {overhead:+8.1f} ms  (presupuesto {budget} ms)"
+            if (overhead > budget):
+                line += "  LENTO"
+                ok = False
+
+            imported = _imported([*modeArgs, path])
+            extra = sorted(m for m in forbidden if m in imported)
+            if (extra):
+                line += f"  importa {', '.join(extra)}"
+                ok = False
+            print(line)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,183 @@
+import argparse
+import os
 import sys
 from modules import scanner
 from modules.rd_parcer.parser import RDParser
 from modules import state
-from modules.rd_parcer.printer import print_esp
-from modules.tokenizer import annotate_source
 
+# El resto (printer, caché, formatos de salida, servidor, --stats...) se importa
+# al usarlo: el arranque cuenta cuando se llama a esp.py miles de veces.
+# `benchmarks/startup.py` mide ese arranque.
 
-def run(source:str):
-    prefixed = annotate_source(source)
-    tokens = list(scanner.tokens(prefixed))
+# Formatos de `--format`: "tree" y los de `output.WRITERS`
+FORMATS = ("tree", "jsonl", "bin")
+
+# stats.PipelineStats de `--stats` (None = sin medir)
+pipelineStats = None
+
+
+def run(source:str, format="tree"):
+    diagnostics = state.Diagnostics()
+    if (pipelineStats is not None):
+        from modules import stats
+        return report(stats.parse(source, diagnostics, pipelineStats), diagnostics, format)
+
+    tokens = scanner.direct_tokens(source, diagnostics)
     ## Print Tokens
     # for t in tokens:
     #     print(t)
 
-    parser = RDParser(tokens)
+    parser = RDParser(tokens, diagnostics)
     parrafo = parser.parse()
 
-    if (state.hadError): return
+    return report(parrafo, diagnostics, format)
+
+
+def report(parrafo, diagnostics: state.Diagnostics, format="tree") -> bool:
+    """Imprime el resultado de un análisis y devuelve si se aceptó.
+
+    En "tree" los errores van a stdout en lugar del árbol. En los formatos para
+    máquinas stdout es solo de los registros: los errores van a stderr y se
+    escribe igualmente el párrafo, con `null` en las oraciones rechazadas.
+    """
+    if (format == "tree"):
+        diagnostics.print()
+        if (diagnostics.hadError): return False
+    else:
+        diagnostics.print(sys.stderr)
 
+    if (pipelineStats is not None):
+        with pipelineStats.stage("print"):
+            write(parrafo, format)
+    else:
+        write(parrafo, format)
+    return not diagnostics.hadError
+
+
+def write(parrafo, format="tree"):
+    if (format != "tree"):
+        from modules import output
+        sys.stdout.flush()
+        output.WRITERS[format](parrafo, sys.stdout.buffer)
+        return
+
+    from modules.rd_parcer.printer import print_esp
     print_esp(parrafo)
     print ("Acceptado")
 
 
-def runPrompt():
+def runPrompt(format="tree"):
     while (True):
         try:
             line = input("esp> ")
             if (line == ""): continue
         except EOFError: break
         except KeyboardInterrupt: break
-        run(line)
-        state.hadError = False
-
-def runFile(path):
-    with open(path, 'r', encoding='utf-8') as file:
-        run(file.read())
-
-match len(sys.argv)-1:
-    case 0:
-        runPrompt()
-    case 1:
-        path = sys.argv[1]
-        runFile(path)
-    case _:
-        sys.exit(64)
+        run(line, format)
+
+def runFile(path, format="tree"):
+    if (pipelineStats is not None):
+        # Sin caché: se mide el análisis completo
+        with open(path, 'r', encoding='utf-8') as file:
+            return run(file.read(), format)
+
+    diagnostics = state.Diagnostics()
+    if (os.environ.get("ESP_CACHE_DIR")):
+        # Solo con caché hacen falta `cache` (y pickle, hashlib...)
+        from modules import cache
+        parrafo = cache.parse_file(path, diagnostics, cache.ParseCache.from_env())
+    else:
+        from modules import stream
+        with open(path, 'r', encoding='utf-8') as file:
+            parrafo = list(stream.parse_stream(file, diagnostics))
+    return report(parrafo, diagnostics, format)
+
+def runBatch(paths):
+    from modules import batch
+    accepted = True
+    for path, ok, output in batch.check_files(batch.expand_paths(paths)):
+        print(f"== {path}")
+        print(output, end="")
+        accepted = accepted and ok
+
+    if (not accepted): sys.exit(65)
+
+def runCheck(paths):
+    """Solo aceptar/rechazar: los errores se imprimen, pero no el árbol."""
+    from modules import batch
+    from modules import validate
+    paths = batch.expand_paths(paths)
+    accepted = True
+    for path in paths:
+        if (len(paths) > 1): print(f"== {path}")
+        with open(path, 'r', encoding='utf-8') as file:
+            source = file.read()
+
+        diagnostics = state.Diagnostics()
+        ok = validate.validate(source, diagnostics)
+        diagnostics.print()
+        if (ok): print("Acceptado")
+        accepted = accepted and ok
+
+    if (not accepted): sys.exit(65)
+
+def runServer(address, workers=None):
+    """Atiende peticiones JSON por línea en un socket Unix, o por stdin/stdout con "-"."""
+    import asyncio
+    from modules import server
+    try:
+        if (address == "-"):
+            asyncio.run(server.serve_stdio(workers))
+        else:
+            asyncio.run(server.serve_unix(address, workers))
+    except KeyboardInterrupt:
+        pass
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(prog="esp.py", description="Analizador de un subconjunto del español")
+    parser.add_argument("paths", nargs="*", help="ficheros o directorios (ninguno = modo interactivo)")
+    parser.add_argument("--check", action="store_true", help="solo aceptar/rechazar, sin imprimir el árbol")
+    parser.add_argument("--format", choices=FORMATS, default="tree",
+                        help="salida de los textos aceptados: árbol, JSON Lines o binaria")
+    parser.add_argument("--serve", metavar="SOCKET",
+                        help="modo servidor en este socket Unix ('-' = stdin/stdout)")
+    parser.add_argument("--workers", type=int, help="procesos del modo servidor")
+    parser.add_argument("--stats", action="store_true",
+                        help="al terminar, imprimir en stderr tiempos y contadores por etapa")
+    args = parser.parse_args(argv)
+
+    batchMode = len(args.paths) > 1 or any(os.path.isdir(p) for p in args.paths)
+    if (args.format != "tree" and (args.check or batchMode)):
+        parser.error("--format solo se puede usar con un único fichero o en modo interactivo")
+    if (args.stats and (args.check or batchMode or args.serve)):
+        parser.error("--stats solo se puede usar con un único fichero o en modo interactivo")
+    return args
+
+if __name__ == "__main__":
+    args = parseArgs(sys.argv[1:])
+    if (args.serve):
+        runServer(args.serve, args.workers)
+        sys.exit()
+
+    if (args.check):
+        runCheck(args.paths)
+        sys.exit()
+
+    if (args.stats):
+        from modules import stats
+        pipelineStats = stats.PipelineStats()
+
+    accepted = True
+    match len(args.paths):
+        case 0:
+            runPrompt(args.format)
+        case 1 if not os.path.isdir(args.paths[0]):
+            accepted = runFile(args.paths[0], args.format)
+        case _:
+            runBatch(args.paths)
+
+    if (pipelineStats is not None):
+        print(pipelineStats.summary(), file=sys.stderr)
+    if (not accepted): sys.exit(65)
         
 
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+
+from modules import state
+
+
+def expand_paths(paths: list[str]) -> list[str]:
+    """Sustituye cada directorio por sus ficheros (recursivamente, en orden alfabético)."""
+    files: list[str] = []
+
+    for path in paths:
+        if (not os.path.isdir(path)):
+            files.append(path)
+            continue
+
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            files.extend(os.path.join(root, name) for name in sorted(names))
+
+    return files
+
+
+def check_file(path: str) -> tuple[str, bool, str]:
+    """Analiza un fichero y devuelve (path, aceptado, salida impresa)."""
+    # aquí y no arriba: `esp.py --check` usa `expand_paths` sin analizar nada más
+    from modules import cache
+    from modules.rd_parcer.printer import print_esp
+
+    diagnostics = state.Diagnostics()
+    out = io.StringIO()
+
+    with contextlib.redirect_stdout(out):
+        try:
+            parrafo = cache.parse_file(path, diagnostics, cache.ParseCache.from_env())
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error: no se pudo leer el fichero: {e}")
+            return path, False, out.getvalue()
+
+        diagnostics.print(out)
+        if (not diagnostics.hadError):
+            print_esp(parrafo)
+            print("Acceptado")
+
+    return path, not diagnostics.hadError, out.getvalue()
+
+
+def check_files(paths: list[str], workers: int = None):
+    """Reparte los ficheros entre un pool de procesos.
+
+    Cada proceso importa `scanner` (y construye su lexer, si llega a necesitarlo) una sola vez.
+    Los resultados de `check_file` se generan en el mismo orden que `paths`.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+
+    import multiprocessing
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap(check_file, paths, chunksize)
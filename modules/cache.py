@@ -0,0 +1,124 @@
+import hashlib
+import os
+import pickle
+
+from modules import columnar, lexer_rules, ply_lex, scanner, state, tokenizer
+from modules import stream as _stream
+from modules.columnar import TokenColumns
+from modules.rd_parcer import complemento, oraciones, parser, sujeto, verbo
+
+# Cambiar si cambia el formato de las entradas
+FORMAT_VERSION = 2
+
+# Módulos cuyo código determina lo que se guarda de un texto: tokens y árbol
+# (`ply_lex` tokeniza las palabras que no van por el camino rápido del scanner),
+# columnas de los errores (`state`) y formato de los tokens guardados
+# (`columnar`). Si cambia cualquiera, todas las entradas anteriores dejan de valer.
+_GRAMMAR_MODULES = (tokenizer, lexer_rules, ply_lex, scanner, _stream, state, columnar,
+                    parser, sujeto, verbo, complemento, oraciones)
+
+_grammarFingerprint: bytes = None
+
+
+def _grammar_fingerprint() -> bytes:
+    global _grammarFingerprint
+    if (_grammarFingerprint is None):
+        h = hashlib.sha256()
+        for module in _GRAMMAR_MODULES:
+            with open(module.__file__, 'rb') as file:
+                h.update(file.read())
+        _grammarFingerprint = h.digest()
+    return _grammarFingerprint
+
+
+class CachedParse:
+    """Resultado guardado de analizar un fichero: el párrafo, sus errores y sus tokens."""
+    def __init__(self, parrafo: list[oraciones.Oracion], errors: list[state.Diagnostic], columns: TokenColumns):
+        self.parrafo = parrafo
+        self.errors = errors
+        self.columns = columns
+
+
+class ParseCache:
+    """Caché en disco de análisis, indexada por el hash del contenido del fichero.
+
+    La clave incluye también el código de la gramática (`_GRAMMAR_MODULES`) y el
+    léxico en uso, así que un fichero sin cambios se sirve de la caché y uno
+    editado (o analizado con otro léxico) se vuelve a analizar.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ParseCache":
+        """Caché en `$ESP_CACHE_DIR`, o None si la variable no está definida."""
+        directory = os.environ.get("ESP_CACHE_DIR")
+        return cls(directory) if directory else None
+
+    def key(self, path: str) -> str:
+        h = hashlib.sha256()
+        h.update(f"esp-cache:{FORMAT_VERSION}\n".encode())
+        h.update(_grammar_fingerprint())
+        h.update(tokenizer.lexicon_fingerprint().encode('utf-8'))
+
+        with open(path, 'rb') as file:
+            while chunk := file.read(1 << 20):
+                h.update(chunk)
+
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pickle")
+
+    def load(self, key: str) -> CachedParse:
+        try:
+            with open(self._path(key), 'rb') as file:
+                entry = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # entrada corrupta o de otra versión (pickle puede lanzar casi
+            # cualquier excepción con datos basura): se trata como un fallo
+            return None
+
+        return entry if isinstance(entry, CachedParse) else None
+
+    def store(self, key: str, entry: CachedParse):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # escribir aparte y renombrar, para que otro proceso nunca lea una entrada a medias
+        import tempfile
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(entry, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def parse_file(path: str, diagnostics: state.Diagnostics, cache: ParseCache = None) -> list[oraciones.Oracion]:
+    """Analiza un fichero con `stream.parse_stream`, pasando por `cache` si se da."""
+    if (cache is None):
+        with open(path, 'r', encoding='utf-8') as file:
+            return list(_stream.parse_stream(file, diagnostics))
+
+    key = cache.key(path)
+    entry = cache.load(key)
+    if (entry is not None):
+        cache.hits += 1
+        for error in entry.errors: diagnostics.report(error)
+        return entry.parrafo
+
+    cache.misses += 1
+    errorsBefore = len(diagnostics.errors)
+    columns = TokenColumns()
+    with open(path, 'r', encoding='utf-8') as file:
+        parrafo = list(_stream.parse_stream(file, diagnostics, columns=columns))
+
+    cache.store(key, CachedParse(parrafo, diagnostics.errors[errorsBefore:], columns))
+    return parrafo
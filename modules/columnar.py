@@ -0,0 +1,125 @@
+# Flujo de tokens en columnas: en lugar de un LexToken por token se guardan
+# cuatro arrays paralelos (tipo, inicio, longitud, línea), que se pueden
+# escribir a disco y volver a abrir con mmap sin copiarlos. Los arrays admiten
+# el protocolo de buffer, así que `numpy.frombuffer(cols.types, numpy.uint8)`
+# los ve sin copia.
+#
+# Formato (enteros little-endian):
+#
+#     magic     8 bytes   b"ESPTOK\x00\x01"
+#     count     uint64    número de tokens
+#     types     uint8[count]    índice en TYPES (relleno hasta múltiplo de 8)
+#     starts    uint64[count]   lexpos del token
+#     lengths   uint32[count]   longitud de su valor
+#     lines     uint32[count]   lineno
+#
+# `starts`/`lengths` delimitan el valor en el texto original con los tokens de
+# `scanner.direct_tokens`; con `scanner.tokens` `lexpos` apunta al texto anotado.
+
+import mmap
+import struct
+import sys
+from array import array
+
+from modules.lexer_rules import Token, KINDS
+
+# Código de tipo = `token.kind` (posición en Token)
+TYPES: tuple[Token, ...] = tuple(Token)
+TYPE_CODES: dict[str, int] = KINDS
+
+_MAGIC = b"ESPTOK\x00\x01"
+_HEADER = struct.Struct("<8sQ")
+
+# (columna, typecode de array/memoryview, bytes por elemento)
+_COLUMNS = (("types", 'B', 1), ("starts", 'Q', 8), ("lengths", 'I', 4), ("lines", 'I', 4))
+
+
+class TokenColumns:
+    """Tokens como arrays paralelos `types`, `starts`, `lengths` y `lines`."""
+    def __init__(self):
+        self.types = array('B')
+        self.starts = array('Q')
+        self.lengths = array('I')
+        self.lines = array('I')
+        self._mm = None
+
+    @classmethod
+    def from_tokens(cls, tokens) -> "TokenColumns":
+        """Convierte un iterable de LexToken (los EOF se omiten)."""
+        cols = cls()
+        for _ in cols.record(tokens): pass
+        return cols
+
+    def record(self, tokens):
+        """Genera los mismos tokens que `tokens` a la vez que los añade a las columnas."""
+        eof = TYPE_CODES[Token.EOF]
+        types, starts, lengths, lines = self.types, self.starts, self.lengths, self.lines
+
+        for token in tokens:
+            code = token.kind
+            if (code != eof):
+                types.append(code)
+                starts.append(token.lexpos)
+                lengths.append(len(token.value))
+                lines.append(token.lineno)
+            yield token
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def type_counts(self) -> dict[Token, int]:
+        """Frecuencia de cada categoría de token."""
+        data = bytes(self.types)
+        return {t: data.count(code) for code, t in enumerate(TYPES) if t != Token.EOF}
+
+    def write(self, path: str):
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, len(self)))
+            for name, _, size in _COLUMNS:
+                column = getattr(self, name)
+                if (sys.byteorder != 'little' and size > 1):
+                    column = array(column.typecode, column)
+                    column.byteswap()
+                file.write(bytes(column))
+                file.write(b"\0" * (-len(self) * size % 8))
+
+    @classmethod
+    def load(cls, path: str) -> "TokenColumns":
+        """Abre un fichero escrito con `write` mapeándolo en memoria (solo lectura)."""
+        cols = cls()
+        with open(path, 'rb') as file:
+            cols._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(cols._mm, 0)
+        if (magic != _MAGIC):
+            raise ValueError(f"'{path}' no es un fichero de tokens de esp")
+
+        pos = _HEADER.size
+        view = memoryview(cols._mm)
+        for name, typecode, size in _COLUMNS:
+            end = pos + count * size
+            if (sys.byteorder == 'little' or size == 1):
+                column = view[pos:end].cast(typecode)
+            else:
+                column = array(typecode)
+                column.frombytes(view[pos:end])
+                column.byteswap()
+            setattr(cols, name, column)
+            pos = end + (-count * size % 8)
+
+        return cols
+
+
+if __name__ == "__main__":
+    # python -m modules.columnar texto.txt tokens.tok
+    from modules import scanner, state
+
+    if (len(sys.argv) != 3): sys.exit(64)
+    with open(sys.argv[1], 'r', encoding='utf-8') as file:
+        source = file.read()
+
+    diagnostics = state.Diagnostics()
+    cols = TokenColumns.from_tokens(scanner.direct_tokens(source, diagnostics))
+    cols.write(sys.argv[2])
+    diagnostics.print(sys.stderr)
+    print(f"{len(cols)} tokens -> {sys.argv[2]}")
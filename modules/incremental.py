@@ -0,0 +1,148 @@
+from bisect import bisect_left, bisect_right
+
+from modules import scanner
+from modules import state
+from modules.stream import _SENTENCE_END
+from modules.rd_parcer.parser import RDParser
+import modules.rd_parcer.oraciones as Oraciones
+
+
+class Segment:
+    """Trozo del documento entre dos puntos finales, analizado por separado.
+
+    Cada oración de la gramática es independiente (`parrafo -> oracion*`) y el
+    parser nunca se recupera de un error más allá de un punto, así que analizar
+    los segmentos uno a uno da el mismo resultado que analizar el texto entero.
+    """
+    __slots__ = ('start', 'end', 'lineno', 'tokens', 'oraciones', 'errors')
+
+    def __init__(self, start, end, lineno, tokens, oraciones, errors):
+        self.start = start
+        self.end = end
+        self.lineno = lineno
+        self.tokens = tokens
+        self.oraciones = oraciones
+        self.errors = errors
+
+
+class Document:
+    """Texto analizado que se puede editar re-analizando solo las oraciones tocadas.
+
+    `RDParser.parse` devuelve una lista de oraciones sin su posición en el texto
+    (y None en las que tienen errores), así que el análisis previo se guarda
+    aquí junto con el tramo de cada oración. `edit` vuelve a etiquetar,
+    tokenizar y analizar solo los segmentos que se solapan con la edición y
+    desplaza `lineno`/`lexpos` de los tokens (y la línea/columna de los errores)
+    de los demás.
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.segments: list[Segment] = list(_parse_range(text, 0, len(text), 1))
+
+    @property
+    def parrafo(self) -> list[Oraciones.Oracion]:
+        """Lo mismo que devolvería `RDParser.parse` sobre el texto completo."""
+        return [o for segment in self.segments for o in segment.oraciones]
+
+    @property
+    def errors(self) -> list[state.Diagnostic]:
+        return [e for segment in self.segments for e in segment.errors]
+
+    def edit(self, offset: int, removed: int, inserted: str) -> list[Oraciones.Oracion]:
+        """Sustituye `removed` caracteres a partir de `offset` por `inserted`.
+
+        Devuelve las oraciones de los segmentos que se han vuelto a analizar.
+        """
+        old = self.text
+        if (not 0 <= offset <= offset + removed <= len(old)):
+            raise ValueError(f"edición fuera del texto: {offset}+{removed} (longitud {len(old)})")
+
+        new = old[:offset] + inserted + old[offset+removed:]
+        delta = len(inserted) - removed
+        segments = self.segments
+
+        # Segmentos que tocan la edición, incluidos los que solo la rozan: un
+        # punto final deja de serlo si lo que le sigue ya no es un espacio.
+        first = bisect_left(segments, offset, key=lambda s: s.end)
+        last = bisect_right(segments, offset + removed, key=lambda s: s.start) - 1
+        first = min(first, last)
+
+        start = segments[first].start
+        lineno = segments[first].lineno
+        oldEnd = segments[last].end
+        after = last + 1
+
+        # Si el tramo ya no acaba en un punto final, se une con el siguiente segmento
+        end = oldEnd + delta
+        while after < len(segments) and not _ends_sentence(new, end):
+            oldEnd = segments[after].end
+            end = oldEnd + delta
+            after += 1
+
+        reparsed = list(_parse_range(new, start, end, lineno))
+
+        dlines = new.count('\n', start, end) - old.count('\n', start, oldEnd)
+        if (after < len(segments)):
+            self._shift(segments[after:], old, new, oldEnd, end, delta, dlines)
+
+        segments[first:after] = reparsed
+        self.text = new
+        return [o for segment in reparsed for o in segment.oraciones]
+
+    @staticmethod
+    def _shift(segments, old, new, oldEnd, end, delta, dlines):
+        # Los errores en la misma línea en la que acaba el tramo editado cambian de columna
+        sharedLine = segments[0].lineno
+        dcolumn = (end - new.rfind('\n', 0, end)) - (oldEnd - old.rfind('\n', 0, oldEnd))
+
+        for segment in segments:
+            segment.start += delta
+            segment.end += delta
+            for token in segment.tokens:
+                token.lexpos += delta
+                token.lineno += dlines
+            for error in segment.errors:
+                if (error.line == sharedLine and error.column is not None):
+                    error.column += dcolumn
+                error.line += dlines
+            segment.lineno += dlines
+
+
+def _ends_sentence(text: str, pos: int) -> bool:
+    return pos >= len(text) or (pos > 0 and _SENTENCE_END.match(text, pos - 1) is not None)
+
+
+def _parse_range(text: str, start: int, end: int, lineno: int):
+    """Divide text[start:end] en segmentos por sus puntos finales y analiza cada uno."""
+    column = start - text.rfind('\n', 0, start)
+
+    pieceStart = start
+    for m in _SENTENCE_END.finditer(text, start):
+        if (m.end() >= end): break
+        yield _parse_segment(text, pieceStart, m.end(), lineno, column)
+        lineno, column = _advance(text, pieceStart, m.end(), lineno, column)
+        pieceStart = m.end()
+
+    yield _parse_segment(text, pieceStart, end, lineno, column)
+
+
+def _advance(text, start, end, lineno, column):
+    newlines = text.count('\n', start, end)
+    if (not newlines): return lineno, column + end - start
+    return lineno + newlines, end - text.rfind('\n', start, end)
+
+
+def _parse_segment(text, start, end, lineno, column) -> Segment:
+    diagnostics = state.Diagnostics()
+    tokens = []
+    # los tokens se guardan según los pide el parser, para que los errores
+    # léxicos y sintácticos queden en el mismo orden que con `parse_stream`
+    scanned = scanner.direct_tokens(text[start:end], diagnostics, lineno, start, column=column)
+    oraciones = RDParser(_record(scanned, tokens), diagnostics).parse()
+    return Segment(start, end, lineno, tokens, oraciones, diagnostics.errors)
+
+
+def _record(tokens, into: list):
+    for token in tokens:
+        into.append(token)
+        yield token
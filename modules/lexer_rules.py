@@ -16,6 +16,26 @@ class Token(str, Enum):
     #END
     EOF = 'EOF'
 
+# Código entero de cada tipo, en el mismo orden que Token. El scanner lo pone
+# en `token.kind` y el parser compara con él; `token.type` sigue siendo el
+# nombre, para imprimir. Es una clase simple (no un Enum) para que leer
+# `Kind.VERBO` y compararlo cueste lo mismo que con un int.
+class Kind:
+    DETERMINANTE = 0
+    SUSTANTIVO = 1
+    ADJETIVO = 2
+    NOMBRE_PROPIO = 3
+    PREPOSICION = 4
+    VERBO = 5
+    ADVERBIO = 6
+    NO = 7
+    Y = 8
+    PUNTO = 9
+    EOF = 10
+
+KINDS: dict[str, int] = {t.value: getattr(Kind, t.name) for t in Token}
+assert sorted(KINDS.values()) == list(range(len(Token)))
+
 # Mapping for lex library
 tokens = tuple(map(lambda name: Token[name].value, Token._member_names_,))
 
@@ -56,6 +76,22 @@ def t_ADVERBIO(t):
     return t
     
 
+# Las reglas anteriores solo quitan el prefijo: el lexer (`ply_lex`) reconoce
+# estos prefijos directamente y toma `prefix_body` como valor, sin probar la
+# expresión maestra ni llamar a la función. Las funciones siguen siendo la
+# definición de las reglas y se usan si el atajo no encaja.
+prefix_tokens = {
+    'det:': Token.DETERMINANTE.value,
+    'sus:': Token.SUSTANTIVO.value,
+    'adj:': Token.ADJETIVO.value,
+    'nom:': Token.NOMBRE_PROPIO.value,
+    'pre:': Token.PREPOSICION.value,
+    'ver:': Token.VERBO.value,
+    'adv:': Token.ADVERBIO.value,
+}
+prefix_body = r'\w+'
+
+
 t_NO = r'no'
 t_Y = r'y'
 t_PUNTO = r'\.'
@@ -66,14 +102,15 @@ t_PUNTO = r'\.'
 def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
+    t.lexer.lineStart = t.lexpos + len(t.value)
 
 
 # A string containing ignored characters (spaces and tabs)
 t_ignore  = ' ,:;?!\t'  
 
-def onCharError(char, line): ...
+def onCharError(lexer, char, line, lexpos): ...
 
 # Error handling rule
 def t_error(t):
-    onCharError(t.value[0], t.lexer.lineno)
+    onCharError(t.lexer, t.value[0], t.lexer.lineno, t.lexpos)
     t.lexer.skip(1)
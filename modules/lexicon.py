@@ -0,0 +1,117 @@
+# Léxicos externos en un formato binario compacto que se abre con mmap.
+#
+# El fichero no se carga en memoria: se mapea en solo lectura y se busca por
+# búsqueda binaria, así que abrirlo cuesta lo mismo tenga cien palabras o un
+# millón y los procesos de un pool comparten las mismas páginas.
+#
+# Formato (enteros little-endian):
+#
+#     magic     8 bytes   b"ESPLEX\x00\x01"
+#     count     uint32    número de palabras
+#     reserved  uint32
+#     offsets   uint32[count+1]  inicio de cada palabra dentro de `data`
+#     cats      uint8[count]     índice en CATEGORIES
+#     data      palabras en minúsculas, UTF-8, ordenadas por bytes y concatenadas
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from modules.tokenizer import CATEGORIES
+
+_MAGIC = b"ESPLEX\x00\x01"
+_HEADER = struct.Struct("<8sII")
+
+
+class MappedLexicon:
+    """Léxico de solo lectura respaldado por un fichero mapeado en memoria.
+
+    `get(word)` devuelve el prefijo (sin ':') de una palabra en minúsculas o None.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, _ = _HEADER.unpack_from(self._mm, 0)
+        if (magic != _MAGIC):
+            raise ValueError(f"'{path}' no es un léxico de esp")
+
+        start = _HEADER.size
+        end = start + 4 * (self.count + 1)
+        if (sys.byteorder == 'little'):
+            self._offsets = memoryview(self._mm)[start:end].cast('I')
+        else:
+            self._offsets = array('I', self._mm[start:end])
+            self._offsets.byteswap()
+
+        self._cats = memoryview(self._mm)[end:end + self.count]
+        self._data = end + self.count
+
+    def get(self, word: str) -> str:
+        key = word.encode('utf-8')
+        offsets, mm, data = self._offsets, self._mm, self._data
+
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = mm[data + offsets[mid]:data + offsets[mid+1]]
+            if (entry < key): lo = mid + 1
+            elif (entry > key): hi = mid
+            else: return CATEGORIES[self._cats[mid]]
+
+        return None
+
+    def fingerprint(self) -> str:
+        """Identifica el contenido del fichero (ruta, tamaño y fecha de modificación)."""
+        stat = os.stat(self.path)
+        return f"{os.path.abspath(self.path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def write_lexicon(path: str, entries) -> int:
+    """Escribe un léxico a partir de pares (palabra, prefijo). Devuelve el número de palabras.
+
+    Las palabras se guardan en minúsculas; si una aparece varias veces, gana la primera.
+    """
+    words: dict[bytes, int] = {}
+    for word, pref in entries:
+        words.setdefault(word.lower().encode('utf-8'), CATEGORIES.index(pref))
+
+    keys = sorted(words)
+    offsets = array('I', [0])
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+    if (sys.byteorder != 'little'): offsets.byteswap()
+
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, len(keys), 0))
+        file.write(offsets.tobytes())
+        file.write(bytes(words[key] for key in keys))
+        file.writelines(keys)
+
+    return len(keys)
+
+
+def read_tsv(path: str):
+    """Lee un fichero de texto con líneas `palabra<TAB>prefijo` (las vacías y las '#...' se ignoran)."""
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if (not line or line.startswith('#')): continue
+            word, pref = line.split('\t')
+            yield word, pref
+
+
+if __name__ == "__main__":
+    # python -m modules.lexicon palabras.tsv palabras.lex
+    if (len(sys.argv) != 3): sys.exit(64)
+    count = write_lexicon(sys.argv[2], read_tsv(sys.argv[1]))
+    print(f"{count} palabras -> {sys.argv[2]}")
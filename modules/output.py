@@ -0,0 +1,170 @@
+# Formatos de salida para máquinas: el AST de cada oración en JSON Lines o en
+# una codificación binaria compacta. Los dos recorren los nodos por sus
+# `__slots__` (como `printer`), así que siguen solos a las clases del AST.
+#
+# JSON Lines: una línea por oración (`null` si tuvo errores). Cada nodo es un
+# objeto con "tipo" (nombre de la clase) y sus campos; cada token,
+#
+#     {"tipo": "SUSTANTIVO", "valor": "perro", "linea": 1, "inicio": 3, "fin": 8}
+#
+# con `inicio`/`fin` en el texto original (tokens de `scanner.direct_tokens`).
+#
+# Binario (enteros little-endian):
+#
+#     magic     8 bytes   b"ESPAST\x00\x01"
+#     oraciones, cada una: uint32 con su longitud en bytes y los nodos en preorden
+#
+# Cada nodo empieza por un byte: 0 = None, 1 = lista (uint32 con el número de
+# elementos y los elementos), 2 = token (`_TOKEN`: kind, línea, lexpos y
+# longitud en bytes del valor, y el valor en UTF-8), y 3 + i = nodo de la
+# clase `_NODE_TYPES[i]` seguido de sus campos en el orden de `__slots__`.
+import json
+import struct
+
+from modules.lexer_rules import Token
+from modules.ply_lex import LexToken
+import modules.rd_parcer.sujeto as Sujeto
+import modules.rd_parcer.verbo as Verbo
+import modules.rd_parcer.complemento as Complemento
+import modules.rd_parcer.oraciones as Oraciones
+
+# Lo escrito se acumula y se vuelca en bloques de este tamaño
+BUFFER_SIZE = 64 * 1024
+
+
+class BulkWriter:
+    """Acumula trozos de bytes y los escribe en `file` de BUFFER_SIZE en BUFFER_SIZE."""
+    def __init__(self, file, bufferSize: int = BUFFER_SIZE):
+        self.file = file
+        self.bufferSize = bufferSize
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes):
+        self.chunks.append(data)
+        self.size += len(data)
+        if (self.size >= self.bufferSize): self.flush()
+
+    def flush(self):
+        if (self.chunks):
+            self.file.write(b"".join(self.chunks))
+            self.chunks.clear()
+            self.size = 0
+        self.file.flush()
+
+
+## JSON Lines
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+def to_json(astNode):
+    """Convierte un nodo del AST (o token, lista o None) en objetos de `json`."""
+    match astNode:
+        case None: return None
+        case LexToken():
+            return {"tipo": astNode.type, "valor": astNode.value, "linea": astNode.lineno,
+                    "inicio": astNode.lexpos, "fin": astNode.lexpos + len(astNode.value)}
+        case list():
+            return [to_json(el) for el in astNode]
+
+    node = {"tipo": type(astNode).__name__}
+    for name in type(astNode).__slots__:
+        node[name] = to_json(getattr(astNode, name))
+    return node
+
+def write_jsonl(parrafo, file):
+    """Escribe una línea JSON por oración en `file` (binario)."""
+    writer = BulkWriter(file)
+    for oracion in parrafo:
+        writer.write((_encode_json(to_json(oracion)) + "\n").encode('utf-8'))
+    writer.flush()
+
+
+## Binario
+
+_MAGIC = b"ESPAST\x00\x01"
+_LENGTH = struct.Struct("<I")
+_TOKEN = struct.Struct("<BIQI")
+
+_NONE, _LIST, _TOKEN_TAG, _NODE_BASE = 0, 1, 2, 3
+_NODE_TYPES = (Oraciones.OracionSVO, Sujeto.Sujetos, Sujeto.SujetoDet, Sujeto.Nombre,
+               Verbo.Verbo, Complemento.ComplementoPre)
+_NODE_CODES = {cls: _NODE_BASE + i for i, cls in enumerate(_NODE_TYPES)}
+_TYPE_NAMES = tuple(t.value for t in Token)
+
+def _encode(astNode, out: bytearray):
+    match astNode:
+        case None:
+            out.append(_NONE)
+        case LexToken():
+            value = astNode.value.encode('utf-8')
+            out.append(_TOKEN_TAG)
+            out += _TOKEN.pack(astNode.kind, astNode.lineno, astNode.lexpos, len(value))
+            out += value
+        case list():
+            out.append(_LIST)
+            out += _LENGTH.pack(len(astNode))
+            for el in astNode: _encode(el, out)
+        case _:
+            cls = type(astNode)
+            out.append(_NODE_CODES[cls])
+            for name in cls.__slots__: _encode(getattr(astNode, name), out)
+
+def write_binary(parrafo, file):
+    """Escribe las oraciones en `file` (binario) con la codificación compacta."""
+    writer = BulkWriter(file)
+    writer.write(_MAGIC)
+    for oracion in parrafo:
+        body = bytearray()
+        _encode(oracion, body)
+        writer.write(_LENGTH.pack(len(body)) + body)
+    writer.flush()
+
+def _decode(data, pos: int):
+    tag = data[pos]
+    pos += 1
+    if (tag == _NONE): return None, pos
+
+    if (tag == _TOKEN_TAG):
+        kind, lineno, lexpos, length = _TOKEN.unpack_from(data, pos)
+        pos += _TOKEN.size
+        token = LexToken()
+        token.type = _TYPE_NAMES[kind]
+        token.kind = kind
+        token.value = bytes(data[pos:pos + length]).decode('utf-8')
+        token.lineno = lineno
+        token.lexpos = lexpos
+        return token, pos + length
+
+    if (tag == _LIST):
+        count, = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+
+    cls = _NODE_TYPES[tag - _NODE_BASE]
+    fields = []
+    for _ in cls.__slots__:
+        field, pos = _decode(data, pos)
+        fields.append(field)
+    return cls(*fields), pos
+
+def read_binary(file):
+    """Genera las oraciones escritas con `write_binary` (None para las que tuvieron errores)."""
+    if (file.read(len(_MAGIC)) != _MAGIC):
+        raise ValueError("no es una salida binaria de esp")
+
+    while (header := file.read(_LENGTH.size)):
+        length, = _LENGTH.unpack(header)
+        oracion, _ = _decode(file.read(length), 0)
+        yield oracion
+
+
+# Formatos de `esp.py --format` (sus nombres están también en `esp.FORMATS`)
+WRITERS = {
+    "jsonl": write_jsonl,
+    "bin": write_binary,
+}
@@ -38,7 +38,8 @@ import sys
 import types
 import copy
 import os
-import inspect
+# inspect, hashlib and pickle are only needed to build or cache the lexer
+# tables and are imported where used, to keep importing this module cheap
 
 # This tuple contains acceptable string types
 StringTypes = (str, bytes)
@@ -54,10 +55,28 @@ class LexError(Exception):
         self.text = s
 
 # Token class.  This class is used to represent the tokens produced.
+# Slotted: a parsed corpus holds millions of these, so no per-instance __dict__.
+# 'lexer' is only set while a token rule or the error/eof rule runs.
 class LexToken(object):
+    # 'kind' es el código entero del tipo; lo pone quien conoce los tipos (el scanner de esp)
+    __slots__ = ('type', 'kind', 'value', 'lineno', 'lexpos', 'lexer')
+
     def __repr__(self):
         return f'LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})'
 
+    # Compact pickling: just the public fields ('lexer' is never pickled)
+    def __reduce__(self):
+        return (_make_token, (self.type, self.kind, self.value, self.lineno, self.lexpos))
+
+def _make_token(type, kind, value, lineno, lexpos):
+    tok = LexToken()
+    tok.type = type
+    tok.kind = kind
+    tok.value = value
+    tok.lineno = lineno
+    tok.lexpos = lexpos
+    return tok
+
 # This object is a stand-in for a logging object created by the
 # logging module.
 
@@ -118,6 +137,10 @@ class Lexer:
         self.lexliterals = ''         # Literal characters that can be passed through
         self.lexmodule = None         # Module
         self.lineno = 1               # Current line number
+        self.lexstateprefixes = {}    # Dictionary of prefix tables for each state
+        self.lexprefixes = None       # Prefix -> token type ("det:" -> "DETERMINANTE")
+        self.lexprefixlen = 0         # Length of every prefix in lexprefixes
+        self.lexprefixbody = None     # Compiled regex for the value after a prefix
 
     def clone(self, object=None):
         c = copy.copy(self)
@@ -146,6 +169,96 @@ class Lexer:
             c.lexmodule = object
         return c
 
+    # ------------------------------------------------------------
+    # writetab() - Write lexer tables to a file, tagged with the
+    # signature of the rules they were built from
+    # ------------------------------------------------------------
+    def writetab(self, lextab, signature):
+        import pickle
+        tabre = {}
+        for statename, lre in self.lexstatere.items():
+            titem = []
+            for (pat, func), retext in zip(lre, self.lexstateretext[statename]):
+                titem.append((retext, _funcs_to_names(func)))
+            tabre[statename] = titem
+
+        tab = {
+            'signature': signature,
+            'lextokens': sorted(self.lextokens),
+            'lexreflags': self.lexreflags,
+            'lexliterals': self.lexliterals,
+            'lexstateinfo': self.lexstateinfo,
+            'lexstatere': tabre,
+            'lexstateignore': self.lexstateignore,
+            'lexstateerrorf': {s: (f.__name__ if f else None) for s, f in self.lexstateerrorf.items()},
+            'lexstateeoff': {s: (f.__name__ if f else None) for s, f in self.lexstateeoff.items()},
+            'lexstateprefixes': self.lexstateprefixes,
+            'lexprefixlen': self.lexprefixlen,
+            'lexprefixbody': self.lexprefixbody.pattern if self.lexprefixbody else None,
+        }
+
+        # Write next to the target and rename, so a concurrent reader never sees half a file
+        tmp = f'{lextab}.{os.getpid()}.tmp'
+        os.makedirs(os.path.dirname(lextab) or '.', exist_ok=True)
+        with open(tmp, 'wb') as f:
+            pickle.dump(tab, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, lextab)
+
+    # ------------------------------------------------------------
+    # readtab() - Read lexer tables written by writetab(). Returns
+    # False if there is no table, it was built from other rules or by
+    # another version of this module, or it is missing any field. The
+    # lexer is only modified when the whole table has been read
+    # ------------------------------------------------------------
+    def readtab(self, lextab, fdict, signature):
+        import pickle
+        try:
+            with open(lextab, 'rb') as f:
+                tab = pickle.load(f)
+        except Exception:
+            # pickle can raise almost anything on a corrupt file
+            return False
+
+        if not isinstance(tab, dict) or tab.get('signature') != signature:
+            return False
+
+        try:
+            reflags = tab['lexreflags']
+            statere = {}
+            stateretext = {}
+            for statename, lre in tab['lexstatere'].items():
+                titem = []
+                txtitem = []
+                for pat, func_name in lre:
+                    titem.append((re.compile(pat, reflags), _names_to_funcs(func_name, fdict)))
+                    txtitem.append(pat)
+                statere[statename] = titem
+                stateretext[statename] = txtitem
+
+            fields = {
+                'lextokens':        set(tab['lextokens']),
+                'lexreflags':       reflags,
+                'lexliterals':      tab['lexliterals'],
+                'lexstateinfo':     tab['lexstateinfo'],
+                'lexstateignore':   tab['lexstateignore'],
+                'lexstatere':       statere,
+                'lexstateretext':   stateretext,
+                'lexstateerrorf':   {s: fdict[f] if f else None for s, f in tab['lexstateerrorf'].items()},
+                'lexstateeoff':     {s: fdict[f] if f else None for s, f in tab['lexstateeoff'].items()},
+                'lexstateprefixes': tab['lexstateprefixes'],
+                'lexprefixlen':     tab['lexprefixlen'],
+            }
+            if tab['lexprefixbody'] is not None:
+                fields['lexprefixbody'] = re.compile(tab['lexprefixbody'], reflags)
+            fields['lextokens_all'] = fields['lextokens'] | set(fields['lexliterals'])
+        except (KeyError, TypeError, ValueError, AttributeError, re.error):
+            return False
+
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.begin('INITIAL')
+        return True
+
     # ------------------------------------------------------------
     # input() - Push a new string into the lexer
     # ------------------------------------------------------------
@@ -165,6 +278,7 @@ class Lexer:
         self.lexignore = self.lexstateignore.get(state, '')
         self.lexerrorf = self.lexstateerrorf.get(state, None)
         self.lexeoff = self.lexstateeoff.get(state, None)
+        self.lexprefixes = self.lexstateprefixes.get(state, None)
         self.lexstate = state
 
     # ------------------------------------------------------------
@@ -205,6 +319,9 @@ class Lexer:
         lexlen    = self.lexlen
         lexignore = self.lexignore
         lexdata   = self.lexdata
+        lexprefixes = self.lexprefixes
+        prefixlen = self.lexprefixlen
+        prefixbody = self.lexprefixbody
 
         while lexpos < lexlen:
             # This code provides some short-circuit code for whitespace, tabs, and other ignored characters
@@ -212,6 +329,23 @@ class Lexer:
                 lexpos += 1
                 continue
 
+            # Prefix-tagged words ("pfx:word"): dispatch on the prefix and take the
+            # value span directly, without the master regex or a rule function.
+            # Anything that doesn't fit goes through the generic rules below.
+            if lexprefixes:
+                prefixend = lexpos + prefixlen
+                toktype = lexprefixes.get(lexdata[lexpos:prefixend])
+                if toktype is not None:
+                    m = prefixbody.match(lexdata, prefixend)
+                    if m:
+                        tok = LexToken()
+                        tok.type = toktype
+                        tok.value = m.group()
+                        tok.lineno = self.lineno
+                        tok.lexpos = lexpos
+                        self.lexpos = m.end()
+                        return tok
+
             # Look for a regular expression match
             for lexre, lexindexfunc in self.lexre:
                 m = lexre.match(lexdata, lexpos)
@@ -251,6 +385,7 @@ class Lexer:
                 if not newtok:
                     lexpos    = self.lexpos         # This is here in case user has updated lexpos.
                     lexignore = self.lexignore      # This is here in case there was a state change
+                    lexprefixes = self.lexprefixes
                     break
                 return newtok
             else:
@@ -340,6 +475,52 @@ def get_caller_module_dict(levels):
     f = sys._getframe(levels)
     return { **f.f_globals, **f.f_locals }
 
+# -----------------------------------------------------------------------------
+# _funcs_to_names()
+#
+# Given a list of regular expression functions, this converts it to a list
+# suitable for output to a table file
+# -----------------------------------------------------------------------------
+def _funcs_to_names(funclist):
+    result = []
+    for f in funclist:
+        if f and f[0]:
+            result.append((f[0].__name__, f[1]))
+        else:
+            result.append(f)
+    return result
+
+# -----------------------------------------------------------------------------
+# _names_to_funcs()
+#
+# Given a list of regular expression function names, this converts it back to
+# functions.
+# -----------------------------------------------------------------------------
+def _names_to_funcs(namelist, fdict):
+    result = []
+    for n in namelist:
+        if n and n[0]:
+            result.append((fdict[n[0]], n[1]))
+        else:
+            result.append(n)
+    return result
+
+# -----------------------------------------------------------------------------
+# _lextab_signature()
+#
+# Identifies the rules a table was built from: the source of the rules module,
+# the compile flags and the source of this module, which defines the table
+# layout and how it is computed. An edit to either file invalidates the table.
+# -----------------------------------------------------------------------------
+def _lextab_signature(ldict, reflags):
+    import hashlib
+    h = hashlib.sha256()
+    h.update(f'lextab:{reflags}\n'.encode())
+    for path in (ldict['__file__'], __file__):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
 # -----------------------------------------------------------------------------
 # _form_master_re()
 #
@@ -581,6 +762,7 @@ class LexerReflect(object):
 
     # Validate all of the t_rules collected
     def validate_rules(self):
+        import inspect
         for state in self.stateinfo:
             # Validate all rules defined by functions
 
@@ -684,6 +866,7 @@ class LexerReflect(object):
     # -----------------------------------------------------------------------------
 
     def validate_module(self, module):
+        import inspect
         try:
             lines, linen = inspect.getsourcelines(module)
         except IOError:
@@ -715,7 +898,7 @@ class LexerReflect(object):
 # Build all of the regular expression rules from definitions in the supplied module
 # -----------------------------------------------------------------------------
 def lex(*, module=None, object=None, debug=False, 
-        reflags=int(re.VERBOSE), debuglog=None, errorlog=None):
+        reflags=int(re.VERBOSE), debuglog=None, errorlog=None, lextab=None):
 
     global lexer
 
@@ -745,6 +928,20 @@ def lex(*, module=None, object=None, debug=False,
     else:
         ldict = get_caller_module_dict(2)
 
+    # With `lextab` (a file path) the reflection and validation below only run
+    # when the table is missing or the rules module has changed since it was written
+    signature = None
+    if lextab and not debug:
+        try:
+            signature = _lextab_signature(ldict, reflags)
+        except (OSError, KeyError):
+            signature = None
+        if signature and lexobj.readtab(lextab, ldict, signature):
+            token = lexobj.token
+            input = lexobj.input
+            lexer = lexobj
+            return lexobj
+
     # Collect parser information from the dictionary
     linfo = LexerReflect(ldict, log=errorlog, reflags=reflags)
     linfo.get_all()
@@ -832,6 +1029,22 @@ def lex(*, module=None, object=None, debug=False,
     lexobj.lexstateeoff = linfo.eoff
     lexobj.lexeoff = linfo.eoff.get('INITIAL', None)
 
+    # Prefix fast path (INITIAL state only). `prefix_tokens` maps each prefix to
+    # the token type whose rule just strips it; that rule must produce the same
+    # token as the fast path, which only skips it.
+    prefixes = ldict.get('prefix_tokens')
+    if prefixes:
+        lengths = {len(p) for p in prefixes}
+        if len(lengths) != 1:
+            raise SyntaxError("All prefix_tokens must have the same length")
+        for p, toktype in prefixes.items():
+            if toktype not in lexobj.lextokens:
+                raise SyntaxError(f"Prefix {p!r} maps to unknown token {toktype!r}")
+        lexobj.lexstateprefixes = {'INITIAL': dict(prefixes)}
+        lexobj.lexprefixes = lexobj.lexstateprefixes['INITIAL']
+        lexobj.lexprefixlen = lengths.pop()
+        lexobj.lexprefixbody = re.compile(ldict.get('prefix_body', r'\w+'), reflags)
+
     # Check state information for ignore and error rules
     for s, stype in stateinfo.items():
         if stype == 'exclusive':
@@ -850,6 +1063,12 @@ def lex(*, module=None, object=None, debug=False,
     input = lexobj.input
     lexer = lexobj
 
+    if signature:
+        try:
+            lexobj.writetab(lextab, signature)
+        except OSError:
+            pass    # e.g. read-only install: the tables are just rebuilt every time
+
     return lexobj
 
 # -----------------------------------------------------------------------------
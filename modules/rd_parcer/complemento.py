@@ -2,9 +2,14 @@ from modules.ply_lex import LexToken
 import modules.rd_parcer.sujeto as Sujeto
 
 class Complemento:
-    ...
+    __slots__ = ()
     
 class ComplementoPre(Complemento):
+    __slots__ = ('preposicion', 'sujeto')
+
     def __init__(self, preposicion: LexToken, sujeto: Sujeto.Sujeto):
         self.preposicion = preposicion
-        self.sujeto = sujeto
\ No newline at end of file
+        self.sujeto = sujeto
+
+    def __reduce__(self):
+        return (ComplementoPre, (self.preposicion, self.sujeto))
@@ -0,0 +1,256 @@
+from collections.abc import Iterable, Iterator
+
+from modules.lexer_rules import Token, KINDS
+from modules.ply_lex import LexToken
+from modules import state
+from modules.rd_parcer.parser import ParseError
+import modules.rd_parcer.sujeto as Sujeto
+import modules.rd_parcer.verbo as Verbo
+import modules.rd_parcer.complemento as Complemento
+import modules.rd_parcer.oraciones as Oraciones
+
+# Gramática del README en forma LL(1). Las cadenas son no terminales o
+# acciones ("@..."), que construyen los nodos del AST sobre la pila de valores.
+# La última alternativa de cada no terminal es la de por defecto: se elige con
+# cualquier token que no esté en el FIRST de las demás, igual que los `if
+# match(...)` de RDParser, para que el error salte en el mismo token y con el
+# mismo mensaje.
+_GRAMMAR: dict[str, list[list]] = {
+    'oracion_svo':  [['sujetos', 'verbo', 'complemento?', Token.PUNTO, '@oracion_svo']],
+
+    'sujetos':      [['@list', 'sujeto', '@append', 'sujetos*', '@sujetos']],
+    'sujetos*':     [[Token.Y, '@pop', 'sujeto', '@append', 'sujetos*'],
+                     []],
+    'sujeto':       [[Token.NOMBRE_PROPIO, 'adjetivo?', '@nombre'],
+                     ['sujeto_det']],
+    'sujeto_det':   [[Token.DETERMINANTE, Token.SUSTANTIVO, 'adjetivo?', '@sujeto_det'],
+                     ['@none', Token.SUSTANTIVO, 'adjetivo?', '@sujeto_det']],
+    'adjetivo?':    [[Token.ADJETIVO],
+                     ['@none']],
+
+    'verbo':        [[Token.NO, Token.VERBO, 'objeto?', 'adverbio?', '@verbo'],
+                     ['@none', Token.VERBO, 'objeto?', 'adverbio?', '@verbo']],
+    'objeto?':      [['sujetos'],
+                     ['@none']],
+    'adverbio?':    [[Token.ADVERBIO],
+                     ['@none']],
+
+    'complemento?': [[Token.PREPOSICION, 'sujeto', '@complemento_pre'],
+                     ['@none']],
+}
+
+_START = 'oracion_svo'
+
+# Mensaje de error de cada terminal obligatorio
+_EXPECTED: dict[Token, str] = {
+    Token.SUSTANTIVO: "Se esperaba un sustantivo",
+    Token.VERBO: "Se esperaba un verbo.",
+    Token.PUNTO: "Se esperaba un punto al final de la oración",
+}
+
+
+# Acciones: cada una saca de la pila de valores los hijos del nodo y deja el nodo
+
+def _none(values): values.append(None)
+
+def _list(values): values.append([])
+
+def _pop(values): values.pop()
+
+def _append(values):
+    item = values.pop()
+    values[-1].append(item)
+
+def _sujetos(values):
+    values[-1] = Sujeto.Sujetos(values[-1])
+
+def _nombre(values):
+    adjetivo = values.pop()
+    values[-1] = Sujeto.Nombre(values[-1], adjetivo)
+
+def _sujeto_det(values):
+    adjetivo = values.pop()
+    sustantivo = values.pop()
+    values[-1] = Sujeto.SujetoDet(values[-1], sustantivo, adjetivo)
+
+def _verbo(values):
+    adverbio = values.pop()
+    objeto = values.pop()
+    verbo = values.pop()
+    values[-1] = Verbo.Verbo(values[-1], verbo, objeto, adverbio)
+
+def _complemento_pre(values):
+    sujeto = values.pop()
+    values[-1] = Complemento.ComplementoPre(values[-1], sujeto)
+
+def _oracion_svo(values):
+    values.pop()  # punto
+    complemento = values.pop()
+    verbo = values.pop()
+    values[-1] = Oraciones.OracionSVO(values[-1], verbo, complemento)
+
+_ACTIONS = {
+    '@none': _none, '@list': _list, '@pop': _pop, '@append': _append,
+    '@sujetos': _sujetos, '@nombre': _nombre, '@sujeto_det': _sujeto_det,
+    '@verbo': _verbo, '@complemento_pre': _complemento_pre, '@oracion_svo': _oracion_svo,
+}
+
+
+# Construcción de la tabla de predicción
+
+def _first_sets(grammar) -> tuple[dict[str, set], set]:
+    """FIRST de cada no terminal y conjunto de los anulables (punto fijo)."""
+    first = {name: set() for name in grammar}
+    nullable = set()
+
+    changed = True
+    while changed:
+        changed = False
+        for name, alternatives in grammar.items():
+            for rhs in alternatives:
+                symbols, empty = _first_of(rhs, first, nullable)
+                if (not symbols <= first[name]):
+                    first[name] |= symbols
+                    changed = True
+                if (empty and name not in nullable):
+                    nullable.add(name)
+                    changed = True
+
+    return first, nullable
+
+
+def _first_of(rhs, first, nullable) -> tuple[set, bool]:
+    symbols = set()
+    for symbol in rhs:
+        if (isinstance(symbol, Token)):
+            symbols.add(symbol)
+            return symbols, False
+        if (symbol in _ACTIONS): continue
+
+        symbols |= first[symbol]
+        if (symbol not in nullable): return symbols, False
+
+    return symbols, True
+
+
+# Códigos: terminales = `token.kind`, después los no terminales y las acciones
+_NONTERMINALS: tuple[str, ...] = tuple(_GRAMMAR)
+_NT_BASE = len(Token)
+_ACTION_BASE = _NT_BASE + len(_NONTERMINALS)
+_ACTION_NAMES: tuple[str, ...] = tuple(_ACTIONS)
+
+
+def _code(symbol) -> int:
+    if (isinstance(symbol, Token)): return KINDS[symbol.value]
+    if (symbol in _ACTIONS): return _ACTION_BASE + _ACTION_NAMES.index(symbol)
+    return _NT_BASE + _NONTERMINALS.index(symbol)
+
+
+def _build_table(grammar) -> list[list[tuple[int, ...]]]:
+    """table[no terminal][código de token] -> parte derecha en códigos, al revés (para la pila)."""
+    first, nullable = _first_sets(grammar)
+    table = []
+
+    for name in _NONTERMINALS:
+        *alternatives, default = grammar[name]
+        row = [tuple(map(_code, reversed(default)))] * len(Token)
+
+        predicted: dict[Token, list] = {}
+        for rhs in alternatives:
+            symbols, empty = _first_of(rhs, first, nullable)
+            if (empty):
+                raise ValueError(f"'{name}': solo la última alternativa puede ser vacía")
+            for t in symbols:
+                if (t in predicted):
+                    raise ValueError(f"conflicto LL(1) en '{name}' con {t.value}")
+                predicted[t] = rhs
+                row[KINDS[t.value]] = tuple(map(_code, reversed(rhs)))
+
+        table.append(row)
+
+    return table
+
+
+_TABLE = _build_table(_GRAMMAR)
+_ACTION_FUNCS = tuple(_ACTIONS[name] for name in _ACTION_NAMES)
+_MESSAGES = {KINDS[t.value]: msg for t, msg in _EXPECTED.items()}
+
+_EOF = KINDS[Token.EOF.value]
+_PUNTO = KINDS[Token.PUNTO.value]
+_SYNC = frozenset(KINDS[t.value] for t in (Token.DETERMINANTE, Token.SUSTANTIVO, Token.NOMBRE_PROPIO))
+
+
+class LLParser:
+    """Parser LL(1) dirigido por tabla, con el mismo interfaz y resultado que `RDParser`.
+
+    En lugar de un método por producción usa una pila explícita de símbolos
+    (códigos enteros) y la tabla de predicción `_TABLE` generada a partir de
+    `_GRAMMAR`; produce las mismas clases del AST y los mismos errores
+    (`benchmarks/equivalence.py` lo comprueba). No es más rápido: desde que los
+    tokens llevan `kind`, RDParser le saca un 10-20% en `benchmarks.run`.
+    """
+    def __init__(self, tokens: Iterable[LexToken], diagnostics: state.Diagnostics):
+        self.tokens: Iterator[LexToken] = iter(tokens)
+        self._previous: LexToken = None
+        self._peek: LexToken = next(self.tokens)
+        self.diagnostics: state.Diagnostics = diagnostics
+        self.recoverySkips: int = 0
+
+    def parse(self) -> list[Oraciones.Oracion]:
+        parrafo: list[Oraciones.Oracion] = []
+
+        while (self._peek.kind != _EOF):
+            try:
+                parrafo.append(self._oracion())
+            except ParseError:
+                self._synchronize()
+                parrafo.append(None)
+
+        return parrafo
+
+    def _oracion(self) -> Oraciones.OracionSVO:
+        table = _TABLE
+        actions = _ACTION_FUNCS
+        ntBase, actionBase = _NT_BASE, _ACTION_BASE
+        tokens = self.tokens
+
+        stack = [ntBase + _NONTERMINALS.index(_START)]
+        values = []
+        token = self._peek
+        code = token.kind
+
+        while (stack):
+            symbol = stack.pop()
+            if (symbol < ntBase):
+                if (symbol != code):
+                    raise self._error(token, _MESSAGES[symbol])
+                values.append(token)
+                self._previous = token
+                token = self._peek = next(tokens)
+                code = token.kind
+            elif (symbol < actionBase):
+                stack.extend(table[symbol - ntBase][code])
+            else:
+                actions[symbol - actionBase](values)
+
+        return values.pop()
+
+    ## Error handling
+    def _error(self, token: LexToken, message: str) -> ParseError:
+        self.diagnostics.parseError(token, message)
+        return ParseError()
+
+    # Igual que RDParser._synchronize: ignorar tokens hasta '.' o inicio de oracion (sujeto)
+    def _synchronize(self):
+        if (self._peek.kind != _EOF):
+            self._previous = self._peek
+            self._peek = next(self.tokens)
+            self.recoverySkips += 1
+
+        while (self._peek.kind != _EOF):
+            if (self._previous.kind == _PUNTO): return
+            if (self._peek.kind in _SYNC): return
+
+            self._previous = self._peek
+            self._peek = next(self.tokens)
+            self.recoverySkips += 1
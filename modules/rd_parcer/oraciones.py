@@ -3,10 +3,16 @@ import modules.rd_parcer.sujeto as Sujeto
 import modules.rd_parcer.verbo as Verbo
 import modules.rd_parcer.complemento as Complemento
 
-class Oracion: ...
+class Oracion:
+    __slots__ = ()
 
 class OracionSVO(Oracion):
+    __slots__ = ('sujeto', 'verbo', 'complemento')
+
     def __init__(self, sujeto: Sujeto.Sujeto, verbo: Verbo.Verbo, complemento: Complemento.Complemento):
         self.sujeto = sujeto
         self.verbo = verbo
-        self.complemento = complemento
\ No newline at end of file
+        self.complemento = complemento
+
+    def __reduce__(self):
+        return (OracionSVO, (self.sujeto, self.verbo, self.complemento))
@@ -1,4 +1,6 @@
-from modules.lexer_rules import Token
+from collections.abc import Iterable, Iterator
+
+from modules.lexer_rules import Kind
 from modules.ply_lex import LexToken
 from modules import state
 import modules.rd_parcer.sujeto as Sujeto
@@ -9,9 +11,16 @@ import modules.rd_parcer.oraciones as Oraciones
 
 
 class RDParser:
-    def __init__(self,tokens:list[LexToken]):
-        self.tokens: list[LexToken] = tokens
+    def __init__(self,tokens:Iterable[LexToken], diagnostics: state.Diagnostics):
+        # La gramática solo necesita un token de lookahead y otro de lookbehind,
+        # así que los tokens se consumen de forma perezosa desde cualquier iterable.
+        self.tokens: Iterator[LexToken] = iter(tokens)
         self.current: int = 0
+        self._previous: LexToken = None
+        self._peek: LexToken = next(self.tokens)
+        self.diagnostics: state.Diagnostics = diagnostics
+        # tokens descartados por _synchronize al recuperarse de errores
+        self.recoverySkips: int = 0
 
     
     def parse(self) -> list[Oraciones.Oracion]:
@@ -38,10 +47,10 @@ class RDParser:
         verbo:Verbo.Verbo = self.verbo()
 
         complemento:Complemento.Complemento = None
-        if (self.match(Token.PREPOSICION)):
+        if (self.match(Kind.PREPOSICION)):
             complemento = self.complemento_pre()
         
-        self.consume(Token.PUNTO, "Se esperaba un punto al final de la oración")
+        self.consume(Kind.PUNTO, "Se esperaba un punto al final de la oración")
 
         return Oraciones.OracionSVO(sujeto, verbo, complemento)
     
@@ -52,14 +61,14 @@ class RDParser:
         sujetos: list[Sujeto.Sujeto] = []
         sujetos.append(self.sujeto())
 
-        while (self.match(Token.Y)):
+        while (self.match(Kind.Y)):
             sujetos.append(self.sujeto())
         
         return Sujeto.Sujetos(sujetos)
 
     
     def sujeto(self) -> Sujeto.Sujeto:
-        if (self.match(Token.NOMBRE_PROPIO)):
+        if (self.match(Kind.NOMBRE_PROPIO)):
             return self.nombre()
         
         return self.sujeto_det()
@@ -67,7 +76,7 @@ class RDParser:
     def nombre(self) -> Sujeto.Nombre:
         nombre: LexToken = self.previous()
         adjetivo: LexToken = None
-        if (self.match(Token.ADJETIVO)):
+        if (self.match(Kind.ADJETIVO)):
             adjetivo = self.previous()
         
         return Sujeto.Nombre(nombre, adjetivo)
@@ -76,12 +85,12 @@ class RDParser:
         determinante: LexToken = None
         adjetivo: LexToken = None
 
-        if (self.match(Token.DETERMINANTE)):
+        if (self.match(Kind.DETERMINANTE)):
             determinante = self.previous()
         
-        sustantivo: LexToken = self.consume(Token.SUSTANTIVO, "Se esperaba un sustantivo")
+        sustantivo: LexToken = self.consume(Kind.SUSTANTIVO, "Se esperaba un sustantivo")
 
-        if (self.match(Token.ADJETIVO)):
+        if (self.match(Kind.ADJETIVO)):
             adjetivo = self.previous()
 
         return Sujeto.SujetoDet(determinante, sustantivo, adjetivo)
@@ -91,21 +100,21 @@ class RDParser:
     
     def verbo(self) -> Verbo.Verbo:
         negacion: LexToken = None
-        if (self.match(Token.NO)):
+        if (self.match(Kind.NO)):
             negacion = self.previous()
         
-        verb = self.consume(Token.VERBO, "Se esperaba un verbo.")
+        verb = self.consume(Kind.VERBO, "Se esperaba un verbo.")
 
         
         # objeto opcional
         objeto: Sujeto.Sujetos = None
-        match self.peek().type:
-            case Token.DETERMINANTE | Token.NOMBRE_PROPIO | Token.SUSTANTIVO:
+        match self.peek().kind:
+            case Kind.DETERMINANTE | Kind.NOMBRE_PROPIO | Kind.SUSTANTIVO:
                 objeto = self.sujetos()
         
         # adverbio opcional
         adverbio: LexToken = None
-        if self.match(Token.ADVERBIO):
+        if self.match(Kind.ADVERBIO):
             adverbio = self.previous()
         
         return Verbo.Verbo(negacion, verb, objeto, adverbio)
@@ -127,56 +136,62 @@ class RDParser:
     # Base methods
         
         
-    def consume(self, type: Token, msg:str):
-        if (self.check(type)): return self.advance()
+    # Los tipos se pasan como códigos de `Kind` y se comparan con `token.kind`
+
+    def consume(self, kind: int, msg:str):
+        if (self.check(kind)): return self.advance()
 
-        raise _error(self.peek(), msg)
+        raise self._error(self.peek(), msg)
 
-    def match(self, *tokenTypes: Token) -> bool:
-        for t in tokenTypes:
-            if (self.check(t)):
-                self.advance()
-                return True
+    def match(self, kind: int) -> bool:
+        if (self.check(kind)):
+            self.advance()
+            return True
             
         return False
     
 
-    def check(self, tokenType: Token) -> bool: 
-        if (self.isAtEnd()): return False
-        return self.peek().type == tokenType.value
+    def check(self, kind: int) -> bool: 
+        # nunca se pide Kind.EOF, así que no hace falta mirar isAtEnd()
+        return self._peek.kind == kind
     
     def advance(self) -> LexToken:
-        if (not self.isAtEnd()): self.current+=1
+        if (not self.isAtEnd()):
+            self.current+=1
+            self._previous = self._peek
+            self._peek = next(self.tokens)
         return self.previous()
     
     def isAtEnd(self) -> bool:
-        return self.peek().type == Token.EOF
+        return self._peek.kind == Kind.EOF
     
     def peek(self) -> LexToken:
-        return self.tokens[self.current]
+        return self._peek
 
     def previous(self) -> LexToken:
-        return self.tokens[self.current-1]
+        return self._previous
     
     
     ## Error handling
+    def _error(self, token: LexToken, message: str) -> "ParseError":
+        self.diagnostics.parseError(token, message)
+        return ParseError()
+
     # Ignorar tokens hasta '.' o inicio de oracion (sujeto)
     def _synchronize(self):
+        if (not self.isAtEnd()): self.recoverySkips += 1
         self.advance()
 
         while(not self.isAtEnd()):
-            if (self.previous().type == Token.PUNTO): return
+            if (self.previous().kind == Kind.PUNTO): return
 
-            match self.peek().type:
-                case Token.DETERMINANTE| Token.SUSTANTIVO | Token.NOMBRE_PROPIO:
+            match self.peek().kind:
+                case Kind.DETERMINANTE| Kind.SUSTANTIVO | Kind.NOMBRE_PROPIO:
                     return
                 
             self.advance()
+            self.recoverySkips += 1
 
                 
 ## Error class to stop parsing
 class ParseError(RuntimeError): ...
-
-def _error(token: LexToken, message: str) -> ParseError:
-    state.parseError(token, message)
-    return ParseError()
@@ -1,41 +1,64 @@
-from treelib import Tree, Node
+import sys
+from operator import itemgetter
 
 from modules.ply_lex import LexToken
 
-def print_esp(parrafo):
-    tree = Tree()
+# Mismo dibujo que `treelib.Tree.show()` (line_type="ascii-ex")
+_BRANCH = "├── "
+_LAST = "└── "
+_PIPE = "│   "
+_SPACE = "    "
 
-    pNode = Node("Parrafo")
-    tree.add_node(pNode)
+def print_esp(parrafo, file=None):
+    """Imprime el párrafo como árbol, oración a oración, según se recorre.
 
+    La salida es la misma que daba `treelib.Tree.show()`: hijos ordenados
+    por etiqueta (orden estable) y una línea en blanco al final. `parrafo`
+    puede ser cualquier iterable (p.ej. `stream.parse_stream`); solo se
+    retiene una oración para saber si es la última.
+    """
+    write = (file or sys.stdout).write
+    write("Parrafo\n")
+
+    # Todas las oraciones tienen la misma etiqueta, así que el orden no cambia
+    pending = None
     for oracion in parrafo:
-        _build_tree(oracion, tree, pNode)
-    
-    tree.show()
+        if (oracion is None): continue
+        if (pending is not None): _write_node(write, type(pending).__name__, pending, "", False)
+        pending = oracion
 
-def _build_tree(astNode, tree:Tree, parent:Node) -> Node:
-    match astNode:
-        case None: return
-        case LexToken():
-            n = Node(_lexTokenStr(astNode))
-            tree.add_node(n, parent)
-            return n
-        
-        case list():
-            for el in astNode: _build_tree(el, tree, parent)
-            return
+    if (pending is not None): _write_node(write, type(pending).__name__, pending, "", True)
+    write("\n")
+
+def _write_node(write, label: str, astNode, prefix: str, isLast: bool):
+    write(f"{prefix}{_LAST if isLast else _BRANCH}{label}\n")
+    if (astNode is None): return
 
+    children = _children(astNode)
+    prefix += _SPACE if isLast else _PIPE
+    last = len(children) - 1
+    for i, (childLabel, child) in enumerate(children):
+        _write_node(write, childLabel, child, prefix, i == last)
 
-    children = vars(astNode)
+def _children(astNode) -> list[tuple[str, object]]:
+    """[(etiqueta, nodo)] de los hijos, ordenados por etiqueta; los tokens no tienen nodo."""
+    children = []
+    for name in type(astNode).__slots__:
+        _collect(getattr(astNode, name), children)
 
-    n = Node(type(astNode).__name__)
-    tree.add_node(n, parent)
+    children.sort(key=itemgetter(0))
+    return children
 
-    for child in children.values():
-        _build_tree(child, tree, n)
+def _collect(value, children: list):
+    match value:
+        case None: return
+        case LexToken():
+            children.append((_lexTokenStr(value), None))
+        case list():
+            for el in value: _collect(el, children)
+        case _:
+            children.append((type(value).__name__, value))
 
 
 def _lexTokenStr(t:LexToken) -> str:
     return f'{t.type}({t.value})'
-
-
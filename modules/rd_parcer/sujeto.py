@@ -1,18 +1,34 @@
 from modules.ply_lex import LexToken
 
-class Sujeto(): ...
+class Sujeto():
+    __slots__ = ()
 
 class SujetoDet(Sujeto):
+    __slots__ = ('determinante', 'sustantivo', 'adjetivo')
+
     def __init__(self, determinante: LexToken, sustantivo: LexToken, adjetivo: LexToken):
         self.determinante = determinante
         self.sustantivo = sustantivo
         self.adjetivo = adjetivo
 
+    def __reduce__(self):
+        return (SujetoDet, (self.determinante, self.sustantivo, self.adjetivo))
+
 class Nombre(Sujeto):
+    __slots__ = ('nombre', 'adjetivo')
+
     def __init__(self, nombre:LexToken, adjetivo: LexToken):
         self.nombre = nombre
         self.adjetivo = adjetivo
 
+    def __reduce__(self):
+        return (Nombre, (self.nombre, self.adjetivo))
+
 class Sujetos():
+    __slots__ = ('sujetos',)
+
     def __init__(self, sujetos: list[Sujeto]):
-        self.sujetos = sujetos
\ No newline at end of file
+        self.sujetos = sujetos
+
+    def __reduce__(self):
+        return (Sujetos, (self.sujetos,))
@@ -2,8 +2,13 @@ from modules.ply_lex import LexToken
 import modules.rd_parcer.sujeto as Sujeto
 
 class Verbo:
+    __slots__ = ('negacion', 'verbo', 'objeto', 'adverbio')
+
     def __init__(self, negacion: LexToken, verbo: LexToken, objeto: Sujeto.Sujetos, adverbio: LexToken):
         self.negacion = negacion
         self.verbo = verbo
         self.objeto = objeto
-        self.adverbio = adverbio
\ No newline at end of file
+        self.adverbio = adverbio
+
+    def __reduce__(self):
+        return (Verbo, (self.negacion, self.verbo, self.objeto, self.adverbio))
@@ -1,24 +1,235 @@
+import os as _os
+import re as _re
+
 from modules import ply_lex as _lex
 from modules import lexer_rules as _rules
 from modules import state
+from modules import tokenizer as _tokenizer
+
+def _onCharError(lexer, char, line, lexpos):
+    lexer.diagnostics.error(line, lexer.column(lexpos), f"Caracter no permitido '{char}'")
+
+_rules.onCharError = _onCharError
+# Tablas del lexer ya validadas; se regeneran solas si cambia lexer_rules.py
+_LEXTAB = _os.path.join(_os.path.dirname(__file__), "__pycache__", "lextab.pickle")
+# Se construye la primera vez que hace falta: `direct_tokens` casi nunca lo usa
+_lexer: _lex.Lexer = None
+
+def _base_lexer() -> _lex.Lexer:
+    global _lexer
+    if (_lexer is None): _lexer = _lex.lex(module=_rules, lextab=_LEXTAB)
+    return _lexer
+
+def new_lexer(diagnostics: state.Diagnostics):
+    """Devuelve una copia independiente del lexer (posición, línea y pila de estados propias).
 
-_rules.onCharError = lambda char, line: state.error(line, f"Caracter no permitido '{char}'")
-_lexer = _lex.lex(module=_rules)
+    Las tablas compiladas se comparten, así que es barato crear una por análisis
+    y varios análisis pueden avanzar a la vez en hilos o generadores distintos.
+    Los caracteres no permitidos se registran en `diagnostics`.
+    """
+    lexer = _base_lexer().clone()
+    lexer.lexstatestack = []
+    lexer.lineno = 1
+    lexer.lineStart = 0
+    lexer.diagnostics = diagnostics
+    lexer.column = lambda lexpos: lexpos - lexer.lineStart + 1
+    return lexer
 
-def tokens(source):
-    _lexer.input(source)
+_KINDS = _rules.KINDS
+
+def tokens(source, diagnostics: state.Diagnostics):
+    lexer = new_lexer(diagnostics)
+    lexer.input(source)
+    diagnostics.startLine(1, 0)
     
     while True:
-        token = _lex.token()
+        token = lexer.token()
         if (not token): break
+        if (token.lineno != diagnostics.line): diagnostics.startLine(token.lineno, lexer.lineStart)
+        token.kind = _KINDS[token.type]
         yield token
     
     eofToken = _lex.LexToken()
     eofToken.type = _rules.Token.EOF
+    eofToken.kind = _rules.Kind.EOF
     eofToken.value = None
-    eofToken.lineno = _lexer.lineno
-    eofToken.lexpos = _lexer.lexpos
+    eofToken.lineno = lexer.lineno
+    eofToken.lexpos = lexer.lexpos
+    diagnostics.startLine(lexer.lineno, lexer.lineStart)
 
 
     yield eofToken
 
+
+## Direct mode: raw text -> LexToken, without building the annotated source
+
+# prefijo del tokenizer -> tipo de token del lexer (los mismos del atajo de `ply_lex`)
+_PREFIX_TYPES = {prefix[:-1]: type for prefix, type in _rules.prefix_tokens.items()}
+
+# palabras que el lexer reconoce sin prefijo
+_BARE_TYPES = {
+    ".": _rules.Token.PUNTO.value,
+    "y": _rules.Token.Y.value,
+    "no": _rules.Token.NO.value,
+}
+_PREFIX_KINDS = {prefix: _KINDS[type] for prefix, type in _PREFIX_TYPES.items()}
+# tipos de los tokens con prefijo: PLY les da la posición del prefijo, no la del valor
+_PREFIXED_TYPES = frozenset(_PREFIX_TYPES.values())
+_BARE_KINDS = {word: _KINDS[type] for word, type in _BARE_TYPES.items()}
+# una única cadena por palabra sin prefijo, compartida por todos sus tokens
+_BARE_VALUES = {word: word for word in _BARE_TYPES}
+
+# resultado del tokenizer ("sus") / prefijo escrito en el texto ("sus:") -> (tipo, kind)
+_CLASS_TOKENS = {prefix: (type, _KINDS[type]) for prefix, type in _PREFIX_TYPES.items()}
+_ANNOTATED_TOKENS = {prefix + ":": token for prefix, token in _CLASS_TOKENS.items()}
+
+# palabra (o cuerpo tras `pfx:`) seguida solo de caracteres ignorados: un único
+# token, sin pasar por PLY
+_SIMPLE_BODY = _re.compile(r'(\w+)[%s]*' % _re.escape(_rules.t_ignore))
+_WORD = _re.compile(r'\S+')
+
+
+class SourceToken(_lex.LexToken):
+    """LexToken que no copia su texto: `value` se lee de `source` al pedirlo.
+
+    `source` es el par (texto, posición de su inicio) compartido por todos los
+    tokens de un mismo `direct_tokens`, y el valor ocupa `length` caracteres a
+    partir de `lexpos`.
+    """
+    __slots__ = ('length', 'source')
+
+    @property
+    def value(self):
+        text, base = self.source
+        start = self.lexpos - base
+        return text[start:start + self.length]
+
+
+def direct_tokens(source, diagnostics: state.Diagnostics, lineno=1, lexpos=0, offsets=False, column=1,
+                  classify=None):
+    """Tokeniza `source` directamente, sin generar el texto anotado.
+
+    Produce la misma secuencia de tokens que `tokens(annotate_source(source))`,
+    pero `lineno`/`lexpos` apuntan al texto original (al valor, no al prefijo).
+    `lineno`, `lexpos` y `column` indican dónde empieza `source` cuando es un
+    fragmento de un texto mayor.
+
+    Con `offsets` las palabras se devuelven como `SourceToken`, que guardan
+    posición y longitud en lugar de una copia del texto.
+
+    `classify` sustituye a `tokenizer.classify_word` para las palabras sin
+    anotar (p.ej. para medir aparte el tiempo del etiquetado, ver `stats`).
+    """
+    if (classify is None): classify = _tokenizer.classify_word
+    lineStart = lexpos
+    sourceRef = (source, lexpos) if offsets else None
+
+    # Camino rápido en línea (sin generador ni cadena `pfx:palabra` por palabra);
+    # solo las palabras que no encajan en `_SIMPLE_BODY` pasan por PLY
+    newToken = _lex.LexToken
+    bareTypes, bareKinds, bareValues = _BARE_TYPES, _BARE_KINDS, _BARE_VALUES
+    annotatedTokens, classTokens = _ANNOTATED_TOKENS, _CLASS_TOKENS
+    simpleBody = _SIMPLE_BODY.fullmatch
+    puntoType, puntoKind, puntoValue = _rules.Token.PUNTO.value, _rules.Kind.PUNTO, _BARE_VALUES["."]
+
+    for lineno, line in enumerate(source.split('\n'), lineno):
+        # la primera línea puede haber empezado antes que el fragmento
+        diagnostics.startLine(lineno, lineStart if lineStart != lexpos else lexpos - column + 1)
+
+        for m in _WORD.finditer(line):
+            word = m.group()
+            pos = lineStart + m.start()
+
+            # Separar un punto final pegado: "ciudad." -> "ciudad" + "."
+            period = len(word) > 1 and word.endswith(".")
+            if period:
+                word = word[:-1]
+
+            bare = bareTypes.get(word)
+            if (bare is not None):
+                token = newToken()
+                token.type = bare
+                token.kind = bareKinds[word]
+                token.value = bareValues[word]
+                token.lineno = lineno
+                token.lexpos = pos
+                yield token
+            else:
+                typeKind = annotatedTokens.get(word[:4])
+                if (typeKind is not None):
+                    prefix = None
+                    body = simpleBody(word, 4)
+                    start = 4
+                else:
+                    prefix = classify(word)
+                    typeKind = classTokens[prefix]
+                    body = simpleBody(word)
+                    start = 0
+
+                if (body is None):
+                    yield from _fallback_tokens(word, prefix, pos, lineno, diagnostics)
+                elif (sourceRef is None):
+                    token = newToken()
+                    token.type, token.kind = typeKind
+                    token.value = body.group(1)
+                    token.lineno = lineno
+                    token.lexpos = pos + start
+                    yield token
+                else:
+                    token = SourceToken()
+                    token.type, token.kind = typeKind
+                    token.lineno = lineno
+                    token.lexpos = pos + start
+                    token.length = body.end(1) - start
+                    token.source = sourceRef
+                    yield token
+
+            if period:
+                token = newToken()
+                token.type = puntoType
+                token.kind = puntoKind
+                token.value = puntoValue
+                token.lineno = lineno
+                token.lexpos = pos + len(word)
+                yield token
+
+        lineStart += len(line) + 1
+
+    yield _token(_rules.Token.EOF, _rules.Kind.EOF, None, lineno, lexpos + len(source))
+
+
+def _fallback_tokens(word, prefix, pos, lineno, diagnostics):
+    """Caso raro (caracteres no permitidos, puntos intermedios...): la palabra se deja a PLY.
+
+    `prefix` es la clase que le dio el tokenizer, o None si ya venía anotada.
+    """
+    if (prefix is not None):
+        annotated, added = f"{prefix}:{word}", 4
+    else:
+        annotated, added = word, 0
+
+    wordLexer = new_lexer(diagnostics)
+    wordLexer.input(annotated)
+    wordLexer.lineno = lineno
+
+    def toSource(lexpos):
+        # posición en `annotated` -> posición en el texto original
+        return pos + max(lexpos - added, 0)
+
+    wordLexer.column = lambda lexpos: toSource(lexpos) - wordLexer.diagnostics.lineStart + 1
+    for token in iter(wordLexer.token, None):
+        # como en el camino rápido, los tokens con prefijo apuntan a su valor
+        prefixLen = 4 if (token.type in _PREFIXED_TYPES) else 0
+        token.lexpos = toSource(token.lexpos + prefixLen)
+        token.kind = _KINDS[token.type]
+        yield token
+
+
+def _token(type, kind, value, lineno, lexpos):
+    token = _lex.LexToken()
+    token.type = type
+    token.kind = kind
+    token.value = value
+    token.lineno = lineno
+    token.lexpos = lexpos
+    return token
@@ -0,0 +1,239 @@
+# Modo servidor: un proceso que se queda abierto y analiza documentos bajo
+# demanda, para no pagar el arranque del intérprete (y del lexer) por cada uno.
+#
+# Protocolo: una petición JSON por línea y una respuesta JSON por línea,
+#
+#     -> {"id": 1, "texto": "El perro come."}
+#     <- {"id": 1, "aceptado": true, "errores": [], "parrafo": [...]}
+#
+# `parrafo` usa el formato de `output.to_json` y solo aparece si el texto se
+# acepta; `errores` son los mensajes tal como los imprime `esp.py`. Las
+# respuestas llevan el `id` de su petición y pueden llegar en otro orden.
+#
+# Las peticiones de todas las conexiones se juntan en lotes (hasta BATCH_SIZE,
+# o lo que haya llegado en BATCH_DELAY segundos desde la primera) y cada lote
+# se analiza entero en un proceso del pool.
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import signal
+import sys
+
+from modules import output
+from modules import scanner
+from modules import state
+from modules.rd_parcer.parser import RDParser
+
+BATCH_SIZE = 64
+BATCH_DELAY = 0.002
+# Tamaño máximo de una línea de petición
+MAX_REQUEST = 64 * 1024 * 1024
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def parse_document(text: str) -> dict:
+    """Analiza un documento y devuelve la respuesta (sin `id`)."""
+    diagnostics = state.Diagnostics()
+    parrafo = RDParser(scanner.direct_tokens(text, diagnostics), diagnostics).parse()
+
+    response = {"aceptado": not diagnostics.hadError, "errores": [str(e) for e in diagnostics.errors]}
+    if (not diagnostics.hadError):
+        response["parrafo"] = [output.to_json(oracion) for oracion in parrafo]
+    return response
+
+
+def _init_worker():
+    # Ctrl+C lo atiende el proceso principal, que cierra el pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _new_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    # Los procesos se crean al llegar el primer lote, ya con conexiones abiertas:
+    # con fork heredarían sus sockets y el cliente no vería nunca el cierre
+    context = None
+    if ("forkserver" in multiprocessing.get_all_start_methods()):
+        context = multiprocessing.get_context("forkserver")
+    return concurrent.futures.ProcessPoolExecutor(workers or os.cpu_count() or 1, mp_context=context,
+                                                      initializer=_init_worker)
+
+
+def parse_batch(texts: list[str]) -> list[dict]:
+    """Lo que ejecuta cada proceso del pool: un lote entero por llamada."""
+    return [parse_document(text) for text in texts]
+
+
+class Batcher:
+    """Junta las peticiones en lotes y los reparte entre los procesos de `executor`.
+
+    Puede haber varios lotes analizándose a la vez (uno por proceso libre);
+    mientras tanto se sigue llenando el siguiente.
+    """
+    def __init__(self, executor: concurrent.futures.Executor, batchSize: int = BATCH_SIZE,
+                 delay: float = BATCH_DELAY):
+        self.executor = executor
+        self.batchSize = batchSize
+        self.delay = delay
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.batches = 0
+        self._inFlight: set[asyncio.Task] = set()
+
+    async def parse(self, text: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.delay
+
+            while (len(batch) < self.batchSize):
+                timeout = deadline - loop.time()
+                if (timeout <= 0): break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inFlight.add(task)
+            task.add_done_callback(self._inFlight.discard)
+
+    async def _dispatch(self, batch):
+        self.batches += 1
+        texts = [text for text, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, parse_batch, texts)
+        except Exception as e:
+            for _, future in batch:
+                if (not future.done()): future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if (not future.done()): future.set_result(result)
+
+
+async def _answer(batcher: Batcher, line: bytes, write):
+    requestId = None
+    try:
+        request = json.loads(line)
+        if (not isinstance(request, dict)): raise TypeError("debe ser un objeto JSON")
+        requestId = request.get("id")
+        text = request["texto"]
+        if (not isinstance(text, str)): raise TypeError("'texto' debe ser una cadena")
+    except (ValueError, KeyError, TypeError) as e:
+        # con el `id` si se llegó a leer, para poder emparejar el error con su petición
+        response = {"id": requestId, "error": f"petición no válida: {e}"}
+    else:
+        try:
+            response = {"id": requestId, **await batcher.parse(text)}
+        except Exception as e:
+            response = {"id": requestId, "error": f"{type(e).__name__}: {e}"}
+
+    await write((_encode_json(response) + "\n").encode('utf-8'))
+
+
+async def _read_request(reader: asyncio.StreamReader) -> bytes:
+    """Siguiente línea de `reader`; b"" al final y None si pasa de MAX_REQUEST (se descarta entera)."""
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial                    # última línea, sin salto de línea
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+
+    # Lo leído sigue en el buffer: tirarlo por trozos hasta el fin de la línea
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+def _read_file_request(file) -> bytes:
+    """Como `_read_request`, para un fichero normal (bloqueante)."""
+    line = file.readline(MAX_REQUEST + 1)
+    if (len(line) <= MAX_REQUEST or line.endswith(b"\n")): return line
+
+    while (rest := file.readline(1 << 20)) and not rest.endswith(b"\n"): pass
+    return None
+
+
+async def _serve_lines(batcher: Batcher, readLine, write):
+    """Atiende una conexión: cada línea es una petición, respondida en cuanto está lista.
+
+    `readLine()` devuelve la siguiente línea, b"" al final, o None si era demasiado larga.
+    """
+    pending: set[asyncio.Task] = set()
+    while ((line := await readLine()) != b""):
+        if (line is None):
+            tooLong = {"id": None, "error": f"petición no válida: más de {MAX_REQUEST} bytes"}
+            await write((_encode_json(tooLong) + "\n").encode('utf-8'))
+            continue
+        if (not line.strip()): continue
+        task = asyncio.create_task(_answer(batcher, line, write))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if (pending): await asyncio.wait(pending)
+
+
+async def serve_unix(path: str, workers: int = None):
+    """Sirve peticiones en el socket Unix `path` hasta que se interrumpa."""
+    with _new_pool(workers) as executor:
+        batcher = Batcher(executor)
+        batcherTask = asyncio.create_task(batcher.run())
+
+        async def handle(reader, writer):
+            async def write(data: bytes):
+                writer.write(data)
+                await writer.drain()
+            try:
+                await _serve_lines(batcher, lambda: _read_request(reader), write)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(handle, path, limit=MAX_REQUEST)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcherTask.cancel()
+            if (os.path.exists(path)): os.unlink(path)
+
+
+async def serve_stdio(workers: int = None):
+    """Lee peticiones de stdin y escribe las respuestas en stdout hasta el fin de la entrada.
+
+    stdin puede ser una tubería, un socket o un fichero redirigido (`< peticiones.jsonl`),
+    que se lee en un hilo porque asyncio no puede esperar a un fichero normal.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_REQUEST)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        readLine = lambda: _read_request(reader)
+    except ValueError:
+        stdin = sys.stdin.buffer
+        readLine = lambda: loop.run_in_executor(None, _read_file_request, stdin)
+
+    stdout = sys.stdout.buffer
+    async def write(data: bytes):
+        stdout.write(data)
+        stdout.flush()
+
+    with _new_pool(workers) as executor:
+        batcher = Batcher(executor)
+        batcherTask = asyncio.create_task(batcher.run())
+        try:
+            await _serve_lines(batcher, readLine, write)
+        finally:
+            batcherTask.cancel()
@@ -1,22 +1,72 @@
+import sys
+
 from modules.ply_lex import LexToken
 from modules.lexer_rules import Token
 
-hadError = False
 
+class Diagnostic:
+    """Un error encontrado durante el análisis.
+
+    `column` empieza en 1 y es None cuando no se conoce el inicio de la línea.
+    `token` es None para los errores de caracteres del scanner.
+    """
+    def __init__(self, line: int, column: int, token: LexToken, msg: str):
+        self.line = line
+        self.column = column
+        self.token = token
+        self.msg = msg
+
+    def location(self) -> str:
+        if (self.token is None): return ""
+        if (self.token.type == Token.EOF): return " al final del texto"
+        return f" en '{self.token.value}'"
+
+    def __str__(self) -> str:
+        return f"[linea {self.line}] Error {self.location()}: {self.msg}"
+
+    def __repr__(self) -> str:
+        return f"Diagnostic({self.line},{self.column},{self.token!r},{self.msg!r})"
+
+
+class Diagnostics:
+    """Errores de un análisis (scanner + parser).
+
+    Sustituye al antiguo flag global `hadError`: cada análisis crea el suyo y se lo
+    pasa al scanner y a `RDParser`, que solo registran los errores. Imprimirlos
+    queda a cargo de quien llama (`print`).
+    """
+    def __init__(self):
+        self.errors: list[Diagnostic] = []
+        self.errorCount: int = 0
+
+        # Línea que está leyendo el scanner y posición donde empieza; sirve para
+        # calcular la columna de los errores del parser, que siempre ocurren en
+        # el último token leído.
+        self.line: int = None
+        self.lineStart: int = 0
+
+    @property
+    def hadError(self) -> bool:
+        return self.errorCount > 0
 
-def error(line: int, msg: str):
-    report(line, "", msg)
+    def startLine(self, line: int, lineStart: int):
+        self.line = line
+        self.lineStart = lineStart
 
+    def error(self, line: int, column: int, msg: str):
+        self.report(Diagnostic(line, column, None, msg))
 
-def parseError(token: LexToken, msg: str):
-    if (token.type == Token.EOF):
-        report(token.lineno, " al final del texto", msg)
-    else:
-        report(token.lineno, f" en '{token.value}'", msg)
+    def parseError(self, token: LexToken, msg: str):
+        column = None
+        if (token.lineno == self.line):
+            column = token.lexpos - self.lineStart + 1
 
+        self.report(Diagnostic(token.lineno, column, token, msg))
 
+    def report(self, diagnostic: Diagnostic):
+        self.errorCount += 1
+        self.errors.append(diagnostic)
 
-def report(line:int, location:str, msg:str):
-    global hadError 
-    hadError = True
-    print(f"[linea {line}] Error {location}: {msg}")
+    def print(self, file=None):
+        file = file or sys.stdout
+        file.writelines(f"{d}\n" for d in self.errors)
@@ -0,0 +1,130 @@
+# Instrumentación del pipeline de `esp.py`: tiempo y bloques de memoria de
+# cada etapa, tokens, oraciones, errores por mensaje y tokens saltados al
+# recuperarse de errores. Solo cuesta algo cuando se pide (`--stats` o un
+# PipelineStats propio); el camino normal no pasa por aquí.
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from modules import scanner
+from modules import state
+from modules import tokenizer
+from modules.rd_parcer.parser import RDParser
+
+
+class StageStats:
+    """Acumulado de una etapa: veces, segundos y bloques de memoria netos (`sys.getallocatedblocks`).
+
+    `blocks` es None en las etapas en que no se miden.
+    """
+    __slots__ = ('name', 'calls', 'seconds', 'blocks')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.blocks = 0
+
+
+class PipelineStats:
+    """Contadores de uno o varios análisis.
+
+    `subscribe(callback)` registra una función `callback(stats, stage)` a la
+    que se llama al acabar cada etapa, con su `StageStats` ya actualizado.
+    """
+    def __init__(self):
+        self.stages: dict[str, StageStats] = {}
+        self.documents = 0
+        self.tokens = 0
+        self.sentences = 0
+        self.rejected = 0
+        self.recoverySkips = 0
+        self.errors: Counter[str] = Counter()
+        self._listeners = []
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def record(self, name: str, seconds: float, blocks: int = None) -> StageStats:
+        """Suma una ejecución de la etapa `name` y avisa a los suscriptores."""
+        stage = self.stages.get(name)
+        if (stage is None):
+            stage = self.stages[name] = StageStats(name)
+            if (blocks is None): stage.blocks = None
+
+        stage.calls += 1
+        stage.seconds += seconds
+        if (stage.blocks is not None): stage.blocks += blocks
+        for callback in self._listeners: callback(self, stage)
+        return stage
+
+    @contextmanager
+    def stage(self, name: str):
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, sys.getallocatedblocks() - blocks)
+
+    def count_errors(self, errors: list[state.Diagnostic]):
+        self.errors.update(e.msg for e in errors)
+
+    def summary(self) -> str:
+        lines = [f"{'etapa':10} {'veces':>6} {'ms':>10} {'bloques':>10}"]
+        for stage in self.stages.values():
+            blocks = "-" if (stage.blocks is None) else stage.blocks
+            lines.append(f"{stage.name:10} {stage.calls:6} {stage.seconds*1000:10.2f} {blocks:>10}")
+
+        lines.append(f"documentos {self.documents}, tokens {self.tokens}, oraciones {self.sentences}"
+                     f" ({self.rejected} con errores), tokens saltados al recuperarse {self.recoverySkips}")
+        for msg, count in self.errors.most_common():
+            lines.append(f"{count:6}  {msg}")
+        return "\n".join(lines)
+
+
+def parse(source: str, diagnostics: state.Diagnostics, stats: PipelineStats) -> list:
+    """Analiza `source` como `esp.run`, pero por etapas separadas y medidas.
+
+    - annotate: las llamadas a `tokenizer.classify_word` que hace el scanner,
+      cronometradas una a una a través de su parámetro `classify`. Sin bloques:
+      `sys.getallocatedblocks` recorre todo el heap y medirlo en cada palabra
+      costaría más que etiquetarla, así que sus bloques cuentan en scan.
+    - scan: `scanner.direct_tokens` completo, sin el tiempo de annotate.
+    - parse: `RDParser` sobre la lista de tokens.
+
+    El resultado y los errores son los mismos que sin medir.
+    """
+    errorsBefore = len(diagnostics.errors)
+    tagging = StageStats("annotate")
+    classifyWord = tokenizer.classify_word
+    clock = time.perf_counter
+
+    def classify(word):
+        start = clock()
+        try:
+            return classifyWord(word)
+        finally:
+            tagging.seconds += clock() - start
+
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    tokens = list(scanner.direct_tokens(source, diagnostics, classify=classify))
+    seconds = time.perf_counter() - start
+    blocks = sys.getallocatedblocks() - blocks
+
+    stats.record("annotate", tagging.seconds)
+    stats.record("scan", seconds - tagging.seconds, blocks)
+
+    with stats.stage("parse"):
+        parser = RDParser(tokens, diagnostics)
+        parrafo = parser.parse()
+
+    stats.documents += 1
+    stats.tokens += len(tokens) - 1
+    stats.sentences += len(parrafo)
+    stats.rejected += parrafo.count(None)
+    stats.recoverySkips += parser.recoverySkips
+    stats.count_errors(diagnostics.errors[errorsBefore:])
+    return parrafo
@@ -0,0 +1,81 @@
+import re as _re
+
+from modules import scanner
+from modules import state
+from modules.rd_parcer.parser import RDParser
+
+# Un punto seguido de espacio en blanco cierra la oración: ninguna palabra
+# queda partida y el parser nunca se recupera de un error más allá de un punto.
+_SENTENCE_END = _re.compile(r'\.(?=\s)')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_stream(stream, diagnostics: state.Diagnostics, chunkSize: int = CHUNK_SIZE, offsets=False,
+                 columns=None):
+    """Analiza un flujo de texto oración a oración.
+
+    Lee `stream` en bloques de `chunkSize` caracteres, lo corta en cada punto
+    final y genera las oraciones según se van analizando, igual que las
+    devolvería `RDParser.parse` (None para las oraciones con error, que quedan
+    registradas en `diagnostics`). La memoria usada depende de la oración más
+    larga, no del tamaño del texto. `offsets` se pasa a `scanner.direct_tokens`
+    y, si se da `columns` (`columnar.TokenColumns`), los tokens se van guardando en él.
+    """
+    pending = ""
+    scanFrom = 0
+    lineno = 1
+    lexpos = 0
+    column = 1
+
+    while True:
+        chunk = stream.read(chunkSize)
+        if (not chunk): break
+        pending += chunk
+
+        start = 0
+        for m in _SENTENCE_END.finditer(pending, scanFrom):
+            sentence = pending[start:m.end()]
+            yield from _parse_sentence(sentence, diagnostics, lineno, lexpos, column, offsets, columns)
+            lineno, lexpos, column = _advance(sentence, lineno, lexpos, column)
+            start = m.end()
+
+        pending = pending[start:]
+        # el último punto puede estar esperando el espacio del siguiente bloque
+        scanFrom = max(len(pending) - 1, 0)
+
+    if (pending):
+        yield from _parse_sentence(pending, diagnostics, lineno, lexpos, column, offsets, columns)
+
+
+def sentences(text: str):
+    """Corta `text` en cada punto final, como `parse_stream`.
+
+    Genera (oración, lineno, lexpos, column), con la posición en `text` en que
+    empieza cada trozo tal como la espera `scanner.direct_tokens`. El último
+    trozo puede no acabar en punto (o ser solo espacio en blanco).
+    """
+    lineno, lexpos, column = 1, 0, 1
+    start = 0
+    for m in _SENTENCE_END.finditer(text):
+        sentence = text[start:m.end()]
+        yield sentence, lineno, lexpos, column
+        lineno, lexpos, column = _advance(sentence, lineno, lexpos, column)
+        start = m.end()
+
+    if (start < len(text)):
+        yield text[start:], lineno, lexpos, column
+
+
+def _advance(sentence, lineno, lexpos, column):
+    """Posición (lineno, lexpos, column) justo después de `sentence`."""
+    newlines = sentence.count('\n')
+    lineno += newlines
+    column = len(sentence) - sentence.rindex('\n') if newlines else column + len(sentence)
+    return lineno, lexpos + len(sentence), column
+
+
+def _parse_sentence(sentence, diagnostics, lineno, lexpos, column, offsets, columns):
+    tokens = scanner.direct_tokens(sentence, diagnostics, lineno, lexpos, offsets, column)
+    if (columns is not None): tokens = columns.record(tokens)
+    yield from RDParser(tokens, diagnostics).parse()
@@ -1,3 +1,6 @@
+from array import array
+from collections import OrderedDict
+
 # Prefijos que usamos en el código fuente "interno" del parser:
 #   det:  -> DETERMINANTE
 #   sus:  -> SUSTANTIVO
@@ -9,6 +12,11 @@
 
 _PREFIXES = ("det:", "sus:", "adj:", "nom:", "pre:", "ver:", "adv:")
 
+# Código numérico de cada categoría = su posición aquí. Coincide con la posición
+# del tipo de token correspondiente en `lexer_rules.Token`.
+CATEGORIES = tuple(p[:-1] for p in _PREFIXES)
+_CATEGORY_CODES = {pref: code for code, pref in enumerate(CATEGORIES)}
+
 
 # Diccionario base extraído de los ejemplos aceptados.
 # clave: palabra en minúsculas (sin punto final), valor: prefijo (det/sus/adj/nom/pre/ver/adv)
@@ -48,6 +56,48 @@ _ADV_COMMON = {"rápido", "rapido", "rápidamente", "lentamente",
                 "ayer", "hoy", "mañana", "siempre", "nunca"}
 
 
+# Índice único palabra -> prefijo, precalculado a partir de las listas anteriores.
+# Se construye de menor a mayor prioridad para que cada palabra quede con la
+# categoría que le daría el orden de decisión de `_classify_word`.
+_LEXICON: dict[str, str] = {}
+for _words, _pref in ((_V_COMMON, "ver"), (_ADV_COMMON, "adv"),
+                      (_GENERIC_PRES, "pre"), (_GENERIC_DETS, "det")):
+    _LEXICON.update(dict.fromkeys(_words, _pref))
+_LEXICON.update(_BASE_LEXICON)
+
+
+# Léxicos externos (p.ej. `lexicon.MappedLexicon`), consultados en orden tras `_LEXICON`.
+# Cualquier objeto con `get(palabra_en_minusculas) -> prefijo | None` sirve.
+_EXTERNAL_LEXICONS: list = []
+
+
+def add_lexicon(lexicon):
+    """Añade un léxico externo a la clasificación de palabras."""
+    _EXTERNAL_LEXICONS.append(lexicon)
+    _cache.clear()
+
+
+def load_lexicon(path: str):
+    """Abre (mapeado en memoria) un léxico generado con `lexicon.write_lexicon` y lo añade."""
+    from modules.lexicon import MappedLexicon
+    lexicon = MappedLexicon(path)
+    add_lexicon(lexicon)
+    return lexicon
+
+
+def lexicon_fingerprint() -> str:
+    """Identifica el léxico en uso (índice precalculado y léxicos externos), p.ej. para invalidar cachés."""
+    parts = [repr(sorted(_LEXICON.items()))]
+    for lexicon in _EXTERNAL_LEXICONS:
+        if hasattr(lexicon, "fingerprint"):
+            parts.append(lexicon.fingerprint())
+        elif isinstance(lexicon, dict):
+            parts.append(repr(sorted(lexicon.items())))
+        else:
+            parts.append(repr(lexicon))
+    return "\n".join(parts)
+
+
 def _is_already_annotated(word: str) -> bool:
     """Indica si la palabra ya viene con algún prefijo conocido (o es y/no/.)."""
     if word in (".", "y", "no"):
@@ -60,74 +110,158 @@ def _classify_word(word: str) -> str:
     """Devuelve el prefijo (sin ':') para una palabra NO anotada.
 
     Orden de decisión (muy simple por ser un lenguaje restringido):
-    - Si está en el léxico base extraído de los ejemplos, usamos ese.
-    - Si es un determinante conocido, usamos 'det'.
-    - Si es una preposición conocida, usamos 'pre'.
-    - Si es un adverbio conocido, usamos 'adv'.
-    - Si está en la lista de verbos comunes, usamos 'ver' (VERBO).
+    - Si está en el léxico precalculado (léxico base extraído de los ejemplos,
+      determinantes, preposiciones, adverbios y verbos comunes), usamos ese.
+    - Si está en alguno de los léxicos externos cargados, usamos el primero.
     - Si empieza con mayúscula y no entra en otro caso, la tratamos como nombre propio 'nom'.
     - En cualquier otro caso, la consideramos sustantivo 'sus'.
     """
-    low = word.lower()
-
-    # 1) Léxico base
-    pref = _BASE_LEXICON.get(low)
+    # 1) Léxico precalculado (las claves están en minúsculas: solo pasamos
+    #    a minúsculas si la palabra no aparece tal cual)
+    low = word
+    pref = _LEXICON.get(word)
+    if pref is None:
+        low = word.lower()
+        if low != word:
+            pref = _LEXICON.get(low)
     if pref is not None:
         return pref
 
-    # 2) Determinantes / preposiciones
-    if low in _GENERIC_DETS:
-        return "det"
-    if low in _GENERIC_PRES:
-        return "pre"
-
-    # 3) Adverbios
-    if low in _ADV_COMMON:
-        return "adv"
+    # 2) Léxicos externos
+    for lexicon in _EXTERNAL_LEXICONS:
+        pref = lexicon.get(low)
+        if pref is not None:
+            return pref
 
-    # 4) Verbos comunes
-    if low in _V_COMMON:
-        return "ver"
-
-    # 5) Nombre propio por mayúscula inicial
+    # 3) Nombre propio por mayúscula inicial
     if word and word[0].isupper():
         return "nom"
 
-    # 6) Por defecto, sustantivo
+    # 4) Por defecto, sustantivo
     return "sus"
 
 
+class ClassifyCache:
+    """Caché LRU acotada de `_classify_word`, indexada por la palabra tal cual aparece.
+
+    El texto natural es muy zipfiano: unas pocas formas ("el", "la", "come"...)
+    son la mayoría de las apariciones, así que clasificar cuesta en proporción
+    al vocabulario y no al número de palabras. `hits`, `misses` y `evictions`
+    permiten ajustar `maxsize` según la tasa de aciertos observada.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, str] = OrderedDict()
+
+    def classify(self, word: str) -> str:
+        data = self._data
+        pref = data.get(word)
+        if pref is not None:
+            self.hits += 1
+            try:
+                data.move_to_end(word)
+            except KeyError: pass   # expulsada por otro hilo entretanto
+            return pref
+
+        self.misses += 1
+        pref = _classify_word(word)
+        if (self.maxsize <= 0): return pref
+
+        data[word] = pref
+        while len(data) > self.maxsize:
+            try:
+                data.popitem(last=False)
+            except KeyError: break
+            self.evictions += 1
+        return pref
+
+    def resize(self, maxsize: int):
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché (p.ej. al cambiar los léxicos); los contadores se conservan."""
+        self._data.clear()
+
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._data), "maxsize": self.maxsize}
+
+
+CACHE_SIZE = 64 * 1024
+_cache = ClassifyCache(CACHE_SIZE)
+
+
+def classify_word(word: str) -> str:
+    """Como `_classify_word`, pero pasando por la caché de clasificación."""
+    return _cache.classify(word)
+
+
+def cache_info() -> dict[str, int]:
+    """Contadores de la caché de clasificación (hits, misses, evictions, size, maxsize)."""
+    return _cache.info()
+
+
+def set_cache_size(maxsize: int):
+    """Cambia el tamaño máximo de la caché de clasificación (0 la desactiva)."""
+    _cache.resize(maxsize)
+
+
+def classify_words(words) -> array:
+    """Clasifica de una vez una secuencia de palabras sueltas, sin anotar.
+
+    Cada palabra es lo que `annotate_source` pasaría a `classify_word`: sin
+    prefijo, sin punto final pegado y distinta de "y", "no" y "."; quien llama
+    separa antes el texto (ver `validate._types`). Lanza ValueError si no.
+
+    Devuelve un `array('B')` con el código (posición en `CATEGORIES`) de cada
+    palabra. Solo se llama a `classify_word` una vez por palabra distinta; el
+    recorrido por palabra (deduplicar y traducir a códigos) lo hacen `dict` y
+    `map` en C, sin una llamada Python por palabra.
+    """
+    if (not isinstance(words, (list, tuple))): words = list(words)
+
+    vocabulary = dict.fromkeys(words)
+    for word in vocabulary:
+        if (_is_already_annotated(word) or word.endswith(".")):
+            raise ValueError(f"'{word}' no es una palabra sin anotar")
+        vocabulary[word] = _CATEGORY_CODES[classify_word(word)]
+
+    return array('B', map(vocabulary.__getitem__, words))
+
+
 def annotate_source(source: str) -> str:
     """Devuelve una versión del `source` donde cada palabra lleva su tipo de token como prefijo.
 
     Comportamiento:
     
     - El punto '.' y las palabras 'y' y 'no' se dejan sin prefijo (las reconoce el lexer).
-    - El resto se clasifica con `_classify_word`.
+    - El resto se clasifica con `classify_word`.
     """
     
     annotated_lines: list[str] = []
 
     for line in source.split('\n'):
-        words = line.split()
         annotated_words: list[str] = []
 
-        while len(words) > 0:
-            
-            word = words.pop(0)
-            if (word == ""): continue
-
+        for word in line.split():
             # Separar un punto final pegado: "ciudad." -> "ciudad" + "."
-            if len(word) > 1 and word.endswith("."):
+            period = len(word) > 1 and word.endswith(".")
+            if period:
                 word = word[:-1]
-                words.append(".")
 
-            
             if (not _is_already_annotated(word)):
-                pref = _classify_word(word)
+                pref = classify_word(word)
                 word = f"{pref}:{word}"
-            
+
             annotated_words.append(word)
+            if period:
+                annotated_words.append(".")
 
         annotated_lines.append(" ".join(annotated_words))
 
@@ -0,0 +1,114 @@
+# Validación sin AST: el lenguaje aceptado es regular, así que un texto se
+# acepta si la secuencia de tipos de sus tokens (un carácter por token)
+# encaja en una única expresión regular compilada a partir de la gramática
+# del README. El texto se comprueba oración a oración (cortado como en
+# `stream`) y solo las oraciones rechazadas pasan por el análisis completo, para
+# obtener sus errores.
+import re as _re
+
+from modules import scanner
+from modules import state
+from modules import stream as _stream
+from modules import tokenizer as _tokenizer
+from modules.lexer_rules import Token
+from modules.rd_parcer.parser import RDParser
+
+# Carácter de cada tipo de token
+_CHARS: dict[str, str] = {
+    Token.DETERMINANTE.value: 'D',
+    Token.SUSTANTIVO.value: 'S',
+    Token.ADJETIVO.value: 'A',
+    Token.NOMBRE_PROPIO.value: 'N',
+    Token.PREPOSICION.value: 'P',
+    Token.VERBO.value: 'V',
+    Token.ADVERBIO.value: 'R',
+    Token.NO.value: 'O',
+    Token.Y.value: 'Y',
+    Token.PUNTO.value: '.',
+}
+
+_SUJETO = "(?:NA?|D?SA?)"
+_SUJETOS = f"{_SUJETO}(?:Y{_SUJETO})*"
+_VERBO = f"O?V(?:{_SUJETOS})?R?"
+_ORACION_SVO = f"{_SUJETOS}{_VERBO}(?:P{_SUJETO})?\\."
+
+# parrafo -> oracion* EOF
+_PARRAFO = _re.compile(f"(?:{_ORACION_SVO})*")
+
+_PREFIX_CHARS = {prefix: _CHARS[type] for prefix, type in scanner._PREFIX_TYPES.items()}
+_BARE_CHARS = {word: _CHARS[type] for word, type in scanner._BARE_TYPES.items()}
+# Carácter de cada código de `tokenizer.classify_words`
+_CATEGORY_CHARS = tuple(_PREFIX_CHARS[category] for category in _tokenizer.CATEGORIES)
+
+
+def _word_chars(word: str) -> str:
+    """Tipos de los tokens de una palabra, o None si hace falta el lexer para ella.
+
+    Devuelve "" para una palabra sin anotar (con o sin punto final): su tipo lo
+    decide `tokenizer.classify_words`, junto con el resto de la oración.
+    """
+    chars = _BARE_CHARS.get(word)
+    if (chars is not None): return chars
+
+    # Separar un punto final pegado, como `scanner.direct_tokens`
+    period = ""
+    if (word.endswith(".")):
+        word, period = word[:-1], "."
+        chars = _BARE_CHARS.get(word)
+        if (chars is not None): return chars + period
+
+    if (_tokenizer._is_already_annotated(word)):
+        if (not scanner._SIMPLE_BODY.fullmatch(word, 4)): return None
+        return _PREFIX_CHARS[word[:3]] + period
+
+    if (not scanner._SIMPLE_BODY.fullmatch(word)): return None
+    return ""
+
+
+def token_types(source: str) -> str:
+    """Devuelve los tipos de los tokens de `source` como una cadena de `_CHARS`.
+
+    Devuelve None si alguna palabra no encaja en el camino rápido del scanner
+    (caracteres no permitidos, puntos intermedios...), en cuyo caso solo el
+    análisis completo sabe qué tokens y errores produce.
+    """
+    return _types(source.split(), {})
+
+
+def _types(words: list[str], vocabulary: dict[str, str]) -> str:
+    # `vocabulary` guarda los tipos de las palabras ya vistas, entre llamadas
+    plain = []
+    for word in dict.fromkeys(words):
+        if (word in vocabulary): continue
+        chars = _word_chars(word)
+        if (chars is None): return None
+        if (chars): vocabulary[word] = chars
+        else: plain.append(word)
+
+    # Las palabras sin anotar se clasifican todas de una vez, ya sin el punto
+    if (plain):
+        bodies = [word.removesuffix(".") for word in plain]
+        for word, body, code in zip(plain, bodies, _tokenizer.classify_words(bodies)):
+            vocabulary[word] = _CATEGORY_CHARS[code] + word[len(body):]
+
+    return "".join(map(vocabulary.__getitem__, words))
+
+
+def validate(source: str, diagnostics: state.Diagnostics) -> bool:
+    """Indica si `source` se acepta, sin construir tokens ni AST si no hace falta.
+
+    Cada oración que se rechaza, o que no se puede decidir con sus tipos, se
+    analiza entera (`scanner.direct_tokens` y `RDParser`, con su posición en el
+    texto, como `stream.parse_stream`) para registrar sus errores en `diagnostics`.
+    """
+    errorsBefore = diagnostics.errorCount
+    vocabulary: dict[str, str] = {}
+
+    for sentence, lineno, lexpos, column in _stream.sentences(source):
+        types = _types(sentence.split(), vocabulary)
+        if (types is not None and _PARRAFO.fullmatch(types) is not None): continue
+
+        tokens = scanner.direct_tokens(sentence, diagnostics, lineno, lexpos, column=column)
+        RDParser(tokens, diagnostics).parse()
+
+    return diagnostics.errorCount == errorsBefore